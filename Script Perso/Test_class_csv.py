@@ -0,0 +1,538 @@
+import contextlib
+import csv
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import class_csv
+import main
+from class_csv import (AtomicCSVFile, CSVMerger, ExternalSorter,
+                       ProductQuery, ProductTable, ReportAccumulator)
+
+
+ROWS = [
+    ['Ok', '2.0', '0.50', 'Fruits'],
+    ['Bad', 'abc', '1', 'Fruits'],
+    ['Pomme', '10', '0.3', 'fruits'],
+    ['Carotte', '5', '1.20', 'Légumes'],
+    ['Banane', '7', '0.5', 'Fruits'],
+    ['éclair', '3', '2.5', 'Pâtisserie'],
+    ['Ananas', '1', '3.0', 'Fruits'],
+    ['Zeste', '4', '0.50', 'Fruits'],
+]
+
+
+VALID_ROWS = [row for row in ROWS if row[0] != 'Bad']
+
+
+class MergerTestCase(unittest.TestCase):
+    """Dossier d'entrée temporaire : trois lignes de ROWS par fichier."""
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.input_folder = os.path.join(self.folder.name, 'CSV-init')
+        self.output_folder = os.path.join(self.folder.name, 'CSV-core')
+        os.makedirs(self.input_folder)
+        os.makedirs(self.output_folder)
+        for number, start in enumerate(range(0, len(ROWS), 3)):
+            path = os.path.join(self.input_folder, f"produits_{number}.csv")
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write('Nom,Quantité,Prix,Catégorie\n')
+                for row in ROWS[start:start + 3]:
+                    file.write(','.join(row) + '\n')
+        self.merger = self.make_merger()
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def make_merger(self, **options):
+        return CSVMerger(
+            input_folder=self.input_folder,
+            output_folder=self.output_folder,
+            sort_folder=os.path.join(self.folder.name, 'CSV-sort'),
+            **options)
+
+    @staticmethod
+    def read_csv(path):
+        with open(path, newline='', encoding='utf-8') as file:
+            return list(csv.reader(file))
+
+
+class TestMergedOutput(MergerTestCase):
+
+    def test_source_text_kept(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            table = self.merger.merge_csv_table()
+            path = self.merger.write_merged(table)
+        self.assertEqual(self.read_csv(path)[1:], VALID_ROWS)
+        self.assertIn("Ligne 3 du fichier produits_0.csv ignorée - valeur"
+                      " numérique invalide", output.getvalue())
+
+    def test_stream_matches_table(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            table = self.merger.merge_csv_table()
+            expected = self.read_csv(self.merger.write_merged(table))
+            stream_path = os.path.join(self.folder.name, 'flux.csv')
+            stats = self.merger.merge_csv_stream(stream_path)
+        self.assertEqual(self.read_csv(stream_path), expected)
+        self.assertEqual(stats.total_items, len(table))
+
+    def test_observe_skips_invalid_rows(self):
+        stats = ReportAccumulator()
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            rows = list(stats.observe(ROWS))
+        self.assertEqual(rows, VALID_ROWS)
+        self.assertEqual(stats.total_items, len(VALID_ROWS))
+        self.assertIn("valeur numérique invalide", output.getvalue())
+
+    def test_unreadable_file_skipped(self):
+        # Un dossier au nom de fichier CSV ne peut pas être ouvert
+        os.mkdir(os.path.join(self.input_folder, 'illisible.csv'))
+        cache_folder = os.path.join(self.folder.name, 'CSV-cache')
+        for options in ({}, {'use_mmap': True}, {'workers': 2},
+                        {'use_cache': True, 'cache_folder': cache_folder}):
+            with self.subTest(**options):
+                merger = self.make_merger(**options)
+                with contextlib.redirect_stdout(io.StringIO()) as output:
+                    table = merger.merge_csv_table()
+                self.assertEqual([list(row) for row in table], VALID_ROWS)
+                self.assertIn("Fichier illisible.csv ignoré",
+                              output.getvalue())
+
+    def test_mmap_matches_csv_reader(self):
+        path = os.path.join(self.input_folder, 'guillemets.csv')
+        with open(path, 'wb') as file:
+            file.write('\ufeffNom,Quantité,Prix,Catégorie\r\n'
+                       '"Pêche, plate",2,1.5,Fruits\r\n'
+                       '"Dit ""Reine""",1,2,Fruits\r\n'
+                       'Trop,1,2,3,4\r\n'
+                       '"Sur deux\r\nlignes",1,2,X\r\n'
+                       'Kiwi,abc,1,Fruits\r\n'
+                       'Kiwi,3,1,Fruits\r\n'.encode('utf-8'))
+        results = []
+        for use_mmap in (False, True):
+            merger = self.make_merger(use_mmap=use_mmap)
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                table = merger.merge_csv_table()
+            results.append(([list(row) for row in table],
+                            output.getvalue()))
+        self.assertEqual(results[1], results[0])
+        rows, warnings = results[0]
+        self.assertIn(['Sur deux\nlignes', '1', '2', 'X'], rows)
+        self.assertIn("Ligne 7 du fichier guillemets.csv ignorée - valeur"
+                      " numérique invalide", warnings)
+
+    def test_pipeline_matches_write_merged(self):
+        sorted_path = os.path.join(self.folder.name, 'tri.csv')
+        query = ProductQuery().order_by(2, True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            table = self.merger.merge_csv_table()
+            expected = self.read_csv(self.merger.write_merged(table))
+            expected_sorted = [list(row) for row in query.execute(table)]
+            os.remove(self.merger.merged_output_path())
+            table = self.merger.merge_pipeline(
+                sorted_outputs={sorted_path: query})
+        self.assertEqual(len(table), len(VALID_ROWS))
+        self.assertEqual(self.read_csv(self.merger.merged_output_path()),
+                         expected)
+        self.assertEqual(self.read_csv(sorted_path)[1:], expected_sorted)
+
+    def test_pipeline_write_failure(self):
+        # Un dossier à la place du fichier fusionné : os.replace échoue
+        os.mkdir(self.merger.merged_output_path())
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            table = self.merger.merge_pipeline()
+        self.assertIsNone(table)
+        self.assertIn("Erreur lors de l'écriture", output.getvalue())
+        self.assertNotIn("lecture", output.getvalue())
+        self.assertEqual(os.listdir(self.output_folder),
+                         ['produits_fusionnes.csv'])
+
+    def test_parallel_matches_serial(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            serial = self.merger.merge_csv_files()
+            for use_processes in (False, True):
+                merger = self.make_merger(workers=2,
+                                          use_processes=use_processes)
+                with self.subTest(use_processes=use_processes):
+                    self.assertEqual(merger.merge_csv_files(), serial)
+        self.assertEqual(serial, VALID_ROWS)
+
+
+class TestBatchCommands(MergerTestCase):
+
+    def run_batch(self, *argv):
+        """Lance une commande de main.py ; renvoie le code et la sortie."""
+        args = main.build_parser().parse_args(argv)
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            code = main.run_batch(self.merger, args)
+        return code, output.getvalue()
+
+    def test_filter(self):
+        code, output = self.run_batch('filter', '--price', '0.5',
+                                      '--by', 'nom')
+        self.assertEqual(code, 0)
+        # Les lignes ignorées sont signalées avant l'en-tête
+        rows = list(csv.reader(io.StringIO(output)))
+        start = rows.index(['Nom', 'Quantité', 'Prix', 'Catégorie']) + 1
+        self.assertEqual([row[0] for row in rows[start:]],
+                         ['Banane', 'Ok', 'Zeste'])
+
+    def test_invalid_values(self):
+        for argv in (('filter', '--price', 'abc'),
+                     ('filter', '--quantity', '5kg'),
+                     ('sort', '--by', 'prix', '--limit', '-1')):
+            with self.subTest(argv=argv), \
+                    contextlib.redirect_stderr(io.StringIO()):
+                self.assertEqual(self.run_batch(*argv)[0], 2)
+
+    def test_usage_errors(self):
+        for argv in (('sort', '--by', 'poids'),
+                     ('filter', '--price-range', '1-2'),
+                     ('sort',)):
+            with self.subTest(argv=argv), \
+                    contextlib.redirect_stderr(io.StringIO()), \
+                    self.assertRaises(SystemExit) as context:
+                self.run_batch(*argv)
+            self.assertEqual(context.exception.code, 2)
+
+    def test_merge(self):
+        code, _ = self.run_batch('merge', '--sort-by', 'prix')
+        self.assertEqual(code, 0)
+        self.assertEqual(
+            self.read_csv(self.merger.merged_output_path())[1:], VALID_ROWS)
+        self.assertTrue(os.path.exists(
+            os.path.join(self.merger.sort_folder, 'tri_prix.csv')))
+
+    def test_merge_failure(self):
+        os.mkdir(self.merger.merged_output_path())
+        self.assertEqual(self.run_batch('--pipeline', 'merge')[0], 1)
+
+
+class TestCompression(MergerTestCase):
+
+    EXTRA_ROWS = [['Figue', '6', '4.5', 'Fruits'],
+                  ['Poireau', '2', '1.10', 'Légumes']]
+
+    def test_round_trip(self):
+        for compression in ('gz', 'bz2', 'xz'):
+            module = class_csv.COMPRESSIONS[f'.{compression}']
+            path = os.path.join(self.input_folder,
+                                f"produits_9.csv.{compression}")
+            with module.open(path, 'wt', encoding='utf-8',
+                             newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(['Nom', 'Quantité', 'Prix', 'Catégorie'])
+                writer.writerows(self.EXTRA_ROWS)
+            for use_mmap in (False, True):
+                merger = self.make_merger(compression=compression,
+                                          use_mmap=use_mmap)
+                with self.subTest(compression=compression,
+                                  use_mmap=use_mmap), \
+                        contextlib.redirect_stdout(io.StringIO()):
+                    output_path = merger.write_merged(
+                        merger.merge_csv_table())
+                    self.assertTrue(output_path.endswith(f'.{compression}'))
+                    with class_csv.open_text(output_path) as file:
+                        rows = list(csv.reader(file))
+                    self.assertEqual(rows[1:], VALID_ROWS + self.EXTRA_ROWS)
+            os.remove(path)
+
+
+class TestMergeCache(MergerTestCase):
+
+    def merge(self):
+        """Fusion avec le cache ; renvoie les lignes et les fichiers lus."""
+        merger = self.make_merger(
+            use_cache=True,
+            cache_folder=os.path.join(self.folder.name, 'CSV-cache'))
+        with mock.patch('class_csv._load_csv_file',
+                        wraps=class_csv._load_csv_file) as load, \
+                contextlib.redirect_stdout(io.StringIO()):
+            table = merger.merge_csv_table()
+        read = [os.path.basename(call.args[0]) for call in load.call_args_list]
+        return [list(row) for row in table], read, merger.cache
+
+    def test_unchanged_files_not_reread(self):
+        rows, read, _ = self.merge()
+        self.assertEqual(rows, VALID_ROWS)
+        self.assertEqual(len(read), 3)
+        rows, read, _ = self.merge()
+        self.assertEqual(rows, VALID_ROWS)
+        self.assertEqual(read, [])
+
+    def test_content_change(self):
+        self.merge()
+        with open(os.path.join(self.input_folder, 'produits_1.csv'), 'a',
+                  encoding='utf-8') as file:
+            file.write('Figue,6,4.5,Fruits\n')
+        rows, read, _ = self.merge()
+        self.assertEqual(read, ['produits_1.csv'])
+        self.assertEqual(rows[-3], ['Figue', '6', '4.5', 'Fruits'])
+
+    def test_touch_only(self):
+        self.merge()
+        path = os.path.join(self.input_folder, 'produits_0.csv')
+        mtime_ns = os.stat(path).st_mtime_ns + 10 ** 9
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+        rows, read, cache = self.merge()
+        self.assertEqual(rows, VALID_ROWS)
+        self.assertEqual(read, [])
+        self.assertEqual(cache.manifest['files']['produits_0.csv']
+                         ['mtime_ns'], mtime_ns)
+
+    def test_removed_file(self):
+        self.merge()
+        os.remove(os.path.join(self.input_folder, 'produits_2.csv'))
+        rows, read, cache = self.merge()
+        self.assertEqual(rows, VALID_ROWS[:-2])
+        self.assertEqual(read, [])
+        self.assertNotIn('produits_2.csv', cache.manifest['files'])
+        pickles = [name for name in os.listdir(cache.folder)
+                   if name.endswith('.pickle')]
+        self.assertEqual(len(pickles), 2)
+
+
+class TestAtomicCSVFile(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, 'sortie.csv')
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_concurrent_writers(self):
+        first, second = AtomicCSVFile(self.path), AtomicCSVFile(self.path)
+        first.open().write('a\n')
+        second.open().write('b\n')
+        self.assertNotEqual(first.temp_path, second.temp_path)
+        first.commit()
+        second.commit()
+        with open(self.path, encoding='utf-8') as file:
+            self.assertEqual(file.read(), 'b\n')
+        self.assertEqual(os.listdir(self.folder.name), ['sortie.csv'])
+
+    def test_failed_commit_removes_temp_file(self):
+        os.mkdir(self.path)  # os.replace échoue sur un dossier
+        with self.assertRaises(OSError):
+            with AtomicCSVFile(self.path) as file:
+                file.write('a\n')
+        self.assertEqual(os.listdir(self.folder.name), ['sortie.csv'])
+        self.assertTrue(os.path.isdir(self.path))
+
+    def test_abort(self):
+        with self.assertRaises(RuntimeError):
+            with AtomicCSVFile(self.path + '.gz') as file:
+                file.write('a\n')
+                raise RuntimeError
+        self.assertEqual(os.listdir(self.folder.name), [])
+
+
+class TestExternalSort(MergerTestCase):
+
+    def both_paths(self, query):
+        # Les lignes invalides sont signalées sur la sortie standard
+        with contextlib.redirect_stdout(io.StringIO()):
+            in_memory = [list(row) for row in self.merger.select(query)]
+            # Budget d'un octet : un fichier temporaire par ligne
+            external = [list(row) for row in
+                        self.merger.iter_sorted_external(query, 1)]
+        return in_memory, external
+
+    def test_filter_without_sort(self):
+        query = ProductQuery().where_equal(3, 'fruits')
+        in_memory, external = self.both_paths(query)
+        self.assertEqual(external, in_memory)
+        self.assertIn(['Ok', '2.0', '0.50', 'Fruits'], external)
+        self.assertNotIn('Bad', [row[0] for row in external])
+
+    def test_sort(self):
+        for column in range(4):
+            for reverse in (False, True):
+                query = ProductQuery().order_by(column, reverse)
+                in_memory, external = self.both_paths(query)
+                self.assertEqual(external, in_memory)
+                self.assertEqual(len(external), len(ROWS) - 1)
+
+    def test_filter_and_sort(self):
+        query = ProductQuery().where_range(2, 0.4, 3).order_by(2, True)
+        in_memory, external = self.both_paths(query)
+        self.assertEqual(external, in_memory)
+
+    def test_limit_and_offset(self):
+        for sort in (False, True):
+            query = ProductQuery().limit(3).offset(1)
+            if sort:
+                query.order_by(0)
+            in_memory, external = self.both_paths(query)
+            self.assertEqual(external, in_memory)
+            self.assertEqual(len(external), 3)
+
+    def test_stop_index(self):
+        self.assertIsNone(ProductQuery().stop_index())
+        self.assertEqual(ProductQuery().limit(5).offset(2).stop_index(), 7)
+
+
+class TestReport(unittest.TestCase):
+
+    def setUp(self):
+        rows = VALID_ROWS * 3 + [['Poire', '0.25', '1e3', 'Fruits']]
+        self.rows = rows
+        self.table = ProductTable.from_rows(rows)
+
+    def assertSameStats(self, stats, expected):
+        self.assertEqual(stats.total_items, expected.total_items)
+        self.assertAlmostEqual(stats.total_quantity, expected.total_quantity)
+        self.assertAlmostEqual(stats.total_value, expected.total_value)
+        self.assertEqual(list(stats.categories), list(expected.categories))
+        for category, aggregate in expected.categories.items():
+            other = stats.categories[category]
+            self.assertAlmostEqual(other['quantity'], aggregate['quantity'])
+            self.assertAlmostEqual(other['total_value'],
+                                   aggregate['total_value'])
+            self.assertEqual(other['items'], aggregate['items'])
+
+    @unittest.skipIf(class_csv.np is None, "NumPy n'est pas installé")
+    def test_numpy_matches_pure_python(self):
+        expected = ReportAccumulator(use_numpy=False)
+        expected.update(self.table)
+        stats = ReportAccumulator(use_numpy=True)
+        stats.update(self.table)
+        self.assertSameStats(stats, expected)
+
+    def test_table_matches_rows(self):
+        expected = ReportAccumulator()
+        for row in self.rows:
+            expected.add(row)
+        for use_numpy in (False, True):
+            with self.subTest(use_numpy=use_numpy):
+                stats = ReportAccumulator(use_numpy=use_numpy)
+                stats.update(self.table)
+                self.assertSameStats(stats, expected)
+
+
+# Table avec beaucoup de doublons, de casses et de textes de nombres
+NAMES = ['Pomme', 'pomme', 'Poire', 'Kiwi', 'éclair', 'Éclair']
+PRICES = ['0.5', '0.50', '1', '2.25', '10']
+CATEGORIES = ['Fruits', 'fruits', 'Légumes', 'Pâtisserie']
+MANY_ROWS = [[NAMES[i % 6], str(i % 7), PRICES[i % 5], CATEGORIES[i % 4]]
+             for i in range(120)]
+
+
+class TestIndexes(unittest.TestCase):
+
+    def setUp(self):
+        self.table = ProductTable.from_rows(MANY_ROWS)
+        self.table.build_indexes()
+
+    def scan(self, predicate):
+        return [index for index, row in enumerate(MANY_ROWS)
+                if predicate(row)]
+
+    def test_hash_index(self):
+        for column_index, values in ((0, NAMES + ['ÉCLAIR', 'Absent']),
+                                     (3, CATEGORIES + ['FRUITS'])):
+            column = self.table.text_column(column_index)
+            for value in values:
+                with self.subTest(value=value):
+                    self.assertEqual(
+                        list(column.lookup(value)),
+                        self.scan(lambda row: row[column_index].casefold()
+                                  == value.casefold()))
+
+    def test_sorted_index(self):
+        for column_index in (1, 2):
+            index = self.table.sorted_index(column_index)
+            for low, high in ((0.5, 0.5), (1, 5), (-1, 0), (2.3, 9.9),
+                              (float('-inf'), float('inf'))):
+                with self.subTest(column=column_index, low=low, high=high):
+                    self.assertEqual(
+                        list(index.range(low, high)),
+                        self.scan(lambda row: low <= float(row[column_index])
+                                  <= high))
+
+    def test_queries_match_row_scan(self):
+        queries = [ProductQuery().where_equal(0, 'POMME'),
+                   ProductQuery().where_equal(2, '0.5'),
+                   ProductQuery().where_equal(3, 'fruits')
+                   .where_range(1, 2, 4),
+                   ProductQuery().where_contains(0, 'clair')
+                   .where_equal(2, '10'),
+                   ProductQuery().where_range(2, 1, 1)]
+        for query in queries:
+            with self.subTest(filters=query.filters):
+                self.assertEqual(
+                    [list(row) for row in query.execute(self.table)],
+                    list(filter(query.row_predicate(), MANY_ROWS)))
+
+
+class TestTopK(unittest.TestCase):
+
+    SLICES = [(1, 0), (5, 3), (50, 100), (200, 0)]
+
+    def test_table_top_matches_full_sort(self):
+        table = ProductTable.from_rows(MANY_ROWS)
+        for column_index in range(4):
+            for reverse in (False, True):
+                full = [list(row) for row in ProductQuery()
+                        .order_by(column_index, reverse).execute(table)]
+                for count, start in self.SLICES:
+                    with self.subTest(column=column_index, reverse=reverse,
+                                      count=count, start=start):
+                        query = (ProductQuery()
+                                 .order_by(column_index, reverse)
+                                 .limit(count).offset(start))
+                        self.assertEqual(
+                            [list(row) for row in query.execute(table)],
+                            full[start:start + count])
+
+    def test_external_top_matches_sort(self):
+        for sort_keys in ([(2, True)], [(3, False), (1, True)]):
+            sorter = ExternalSorter(sort_keys)
+            full = list(sorter.sort(MANY_ROWS))
+            for count, _ in self.SLICES:
+                with self.subTest(sort_keys=sort_keys, count=count):
+                    self.assertEqual(sorter.top(MANY_ROWS, count),
+                                     full[:count])
+
+
+class TestBinaryTable(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, 'table.bin')
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.table = ProductTable.from_rows(ROWS)
+        self.table.build_indexes()
+        self.table.save_binary(self.path)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_load_and_close(self):
+        table = ProductTable.load_binary(self.path)
+        self.assertEqual([list(row) for row in table],
+                         [list(row) for row in self.table])
+        mapping = table._mapping
+        table.close()
+        self.assertTrue(mapping.closed)
+        self.assertEqual(len(table), 0)
+        table.close()  # Sans effet la deuxième fois
+
+        # Le fichier n'est plus projeté et peut être remplacé
+        self.table.save_binary(self.path)
+
+    def test_context_manager(self):
+        with ProductTable.load_binary(self.path) as table:
+            result = ProductQuery().order_by(2, True).limit(2).execute(table)
+            self.assertEqual([row[0] for row in result], ['Ananas', 'éclair'])
+            mapping = table._mapping
+        self.assertTrue(mapping.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
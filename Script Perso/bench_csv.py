@@ -0,0 +1,280 @@
+import argparse
+import contextlib
+import csv
+import io
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import class_csv
+from class_csv import (CSVMerger, ProductQuery, ProductTable, TableView,
+                       collation_key)
+
+
+CATEGORIES = ['Fruits', 'Légumes', 'Épicerie', 'boissons', 'Voiture']
+NAMES = ['Pomme', 'éclair', 'Banane', 'carotte', 'Édam', 'Fraise', 'zeste',
+         'Courgette', 'Ananas', 'Œuf']
+
+
+def generate_rows(count: int, seed: int = 0,
+                  categories: Optional[List[str]] = None
+                  ) -> List[List[str]]:
+    """Build synthetic [nom, quantité, prix, catégorie] rows."""
+    rng = random.Random(seed)
+    categories = categories or CATEGORIES
+    return [[f"{rng.choice(NAMES)} {rng.randrange(count // 10 + 1)}",
+             str(rng.randrange(1, 500)),
+             f"{rng.uniform(0.1, 100):.2f}",
+             rng.choice(categories)]
+            for _ in range(count)]
+
+
+def generate_input_folder(folder: str, files: int, rows_per_file: int,
+                          nb_categories: int, seed: int = 0) -> None:
+    """Write a synthetic CSV-init folder of several input files."""
+    os.makedirs(folder, exist_ok=True)
+    categories = [CATEGORIES[i] if i < len(CATEGORIES) else f"Catégorie {i}"
+                  for i in range(nb_categories)]
+    for number in range(files):
+        path = os.path.join(folder, f"produits_{number:03d}.csv")
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(['Nom', 'Quantité', 'Prix', 'Catégorie'])
+            writer.writerows(generate_rows(rows_per_file, seed + number,
+                                           categories))
+
+
+def timed(function: Callable[[], object], repeat: int = 3) -> float:
+    """Return the best wall-clock time of several runs, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of measurements."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1,
+                      math.ceil(fraction * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def measure(function: Callable[[], object], rows: int,
+            repeat: int = 20) -> Dict[str, float]:
+    """Time a stage several times, then trace its peak memory once."""
+    latencies = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            latencies.append(time.perf_counter() - start)
+
+        # Separate run: tracing slows the code down
+        tracemalloc.start()
+        try:
+            function()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    median = statistics.median(latencies)
+    return {'runs': repeat,
+            'mean_ms': statistics.fmean(latencies) * 1000,
+            'p50_ms': median * 1000,
+            'p95_ms': percentile(latencies, 0.95) * 1000,
+            'p99_ms': percentile(latencies, 0.99) * 1000,
+            'rows_per_s': rows / median if median else float('inf'),
+            'peak_memory_kb': peak / 1024}
+
+
+def bench_sort_keys(rows: List[List[str]], repeat: int = 3) -> dict:
+    """Compare per-query float()/str keys with keys precomputed at merge."""
+    low, high = 20.0, 40.0
+    results = {}
+
+    # Keys computed again by every sort and filter
+    results['float_sort'] = timed(
+        lambda: sorted(rows, key=lambda x: float(x[2])), repeat)
+    results['float_range'] = timed(
+        lambda: [x for x in rows if low <= float(x[2]) <= high], repeat)
+    results['text_sort'] = timed(
+        lambda: sorted(rows, key=lambda x: collation_key(x[0])), repeat)
+
+    # Keys computed once when the merged table is built
+    def prepare():
+        table = ProductTable.from_rows(rows)
+        table.build_indexes()
+        return table
+    results['build_table'] = timed(prepare, 1)
+    table = prepare()
+    everything = range(len(table))
+    results['table_sort'] = timed(
+        lambda: table.sort_indices(everything, 2), repeat)
+    results['table_range'] = timed(
+        lambda: table.sorted_index(2).range(low, high), repeat)
+    results['table_text_sort'] = timed(
+        lambda: table.sort_indices(everything, 0), repeat)
+    return results
+
+
+def bench_suite(folder: str, repeat: int = 20) -> Dict[str, Dict]:
+    """Measure the merge, sort, filter, report and write stages."""
+    merger = CSVMerger(input_folder=os.path.join(folder, 'CSV-init'),
+                       output_folder=os.path.join(folder, 'CSV-core'),
+                       sort_folder=os.path.join(folder, 'CSV-sort'))
+    merger.base_dir = folder  # Reports go to the benchmark folder
+    for path in (merger.output_folder, merger.sort_folder):
+        os.makedirs(path, exist_ok=True)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        table = merger.merge_csv_table()
+    rows = len(table)
+    columns = merger.columns
+    top_category = table.categories.values[0]
+
+    stages = {
+        'merge_rows': merger.merge_csv_files,
+        'merge_table': merger.merge_csv_table,
+        'sort_price': lambda: ProductQuery().order_by(
+            columns['prix']).execute(table),
+        'sort_name_desc': lambda: ProductQuery().order_by(
+            columns['nom'], True).execute(table),
+        'top_20_price': lambda: ProductQuery().order_by(
+            columns['prix'], True).limit(20).execute(table),
+        'filter_price_range': lambda: ProductQuery().where_range(
+            columns['prix'], 20, 40).execute(table),
+        'filter_category': lambda: ProductQuery().where_equal(
+            columns['catégorie'], top_category).execute(table),
+        'filter_name_contains': lambda: ProductQuery().where_contains(
+            columns['nom'], 'ana').execute(table),
+        # A view is not cached by report_stats: aggregated on every run
+        'report': lambda: merger.generate_csv_report(TableView(table)),
+        'write_merged': lambda: merger.write_csv(
+            table, os.path.join(merger.output_folder, 'bench.csv')),
+    }
+    return {name: measure(function, rows, repeat)
+            for name, function in stages.items()}
+
+
+def compare(results: Dict, baseline: Dict) -> None:
+    """Print the p50 latency of each stage against a previous run."""
+    print(f"\nComparison with {baseline.get('label') or 'baseline'}")
+    for name, stage in results['stages'].items():
+        previous = baseline.get('stages', {}).get(name)
+        if previous is None:
+            print(f"  {name:<22} new stage")
+            continue
+        ratio = (f"x{stage['p50_ms'] / previous['p50_ms']:.2f}"
+                 if previous['p50_ms'] > 0 else 'n/a')
+        print(f"  {name:<22} {previous['p50_ms']:10.2f} ->"
+              f" {stage['p50_ms']:10.2f} ms  {ratio}")
+
+
+def print_results(title: str, results: dict) -> None:
+    """Print benchmark timings in milliseconds."""
+    print(f"\n{title}")
+    for name, seconds in results.items():
+        print(f"  {name:<16} {seconds * 1000:10.2f} ms")
+
+
+def print_suite(results: Dict) -> None:
+    """Print the suite measurements as a table."""
+    config = results['config']
+    print(f"\nSuite ({config['files']} files x {config['rows_per_file']}"
+          f" rows, {config['categories']} categories)")
+    print(f"  {'stage':<22} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}"
+          f" {'rows/s':>12} {'peak KiB':>10}")
+    for name, stage in results['stages'].items():
+        print(f"  {name:<22} {stage['p50_ms']:10.2f} {stage['p95_ms']:10.2f}"
+              f" {stage['p99_ms']:10.2f} {stage['rows_per_s']:12.0f}"
+              f" {stage['peak_memory_kb']:10.0f}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the benchmark command line parser."""
+    parser = argparse.ArgumentParser(
+        description='Benchmark the CSV merger on synthetic data')
+    commands = parser.add_subparsers(dest='command')
+
+    keys = commands.add_parser(
+        'keys', help='Per-query sort keys against precomputed keys')
+    keys.add_argument('--rows', type=int, default=100000,
+                      help='Number of synthetic rows (default: 100000)')
+    keys.add_argument('--repeat', type=int, default=3,
+                      help='Runs per measurement, best kept (default: 3)')
+
+    suite = commands.add_parser(
+        'suite', help='Merge, sort, filter, report and write stages')
+    suite.add_argument('--files', type=int, default=10,
+                       help='Number of input files (default: 10)')
+    suite.add_argument('--rows-per-file', type=int, default=10000,
+                       help='Rows in each input file (default: 10000)')
+    suite.add_argument('--categories', type=int, default=20,
+                       help='Number of distinct categories (default: 20)')
+    suite.add_argument('--repeat', type=int, default=20,
+                       help='Runs per stage (default: 20); p95 and p99'
+                            ' are the slowest run below 20 and 100 runs')
+    suite.add_argument('--seed', type=int, default=0,
+                       help='Seed of the synthetic data (default: 0)')
+    suite.add_argument('--label',
+                       help='Name of this run, e.g. a version or commit')
+    suite.add_argument('--output', help='Write the results to this JSON file')
+    suite.add_argument('--compare', metavar='JSON',
+                       help='Compare with the results of a previous run')
+    suite.add_argument('--folder',
+                       help='Generate the data here and keep it'
+                            ' (temporary folder otherwise)')
+    return parser
+
+
+def run_suite(args: argparse.Namespace) -> Dict:
+    """Generate the synthetic folder, run the suite and gather metadata."""
+    with contextlib.ExitStack() as stack:
+        folder = args.folder or stack.enter_context(
+            tempfile.TemporaryDirectory(prefix='bench_csv_'))
+        generate_input_folder(os.path.join(folder, 'CSV-init'), args.files,
+                              args.rows_per_file, args.categories, args.seed)
+        stages = bench_suite(folder, args.repeat)
+
+    return {'label': args.label,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': class_csv.np is not None,
+            'config': {'files': args.files,
+                       'rows_per_file': args.rows_per_file,
+                       'categories': args.categories,
+                       'repeat': args.repeat,
+                       'seed': args.seed},
+            'stages': stages}
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+
+    if args.command == 'suite':
+        results = run_suite(args)
+        print_suite(results)
+        if args.compare:
+            with open(args.compare, 'r', encoding='utf-8') as file:
+                compare(results, json.load(file))
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as file:
+                json.dump(results, file, ensure_ascii=False, indent=1)
+            print(f"\nResults written to {args.output}")
+    else:
+        rows = getattr(args, 'rows', 100000)
+        repeat = getattr(args, 'repeat', 3)
+        print_results(f"Sort keys ({rows} rows)",
+                      bench_sort_keys(generate_rows(rows), repeat))
@@ -1,14 +1,2170 @@
+import io
 import os
 import csv
 import sys
-from typing import List, Optional
+import bz2
+import gzip
+import lzma
+import asyncio
+import json
+import mmap
+import heapq
+import pickle
+import struct
+import hashlib
+import tempfile
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from concurrent.futures import (Future, ProcessPoolExecutor,
+                                ThreadPoolExecutor)
+from itertools import compress, islice
+from typing import (Callable, Dict, Iterable, Iterator, List, Optional,
+                    Sequence, Tuple)
 from datetime import datetime
 
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel : repli en Python pur
+    np = None
+
+
+# Modules de compression reconnus, par extension de fichier
+COMPRESSIONS = {'.gz': gzip, '.bz2': bz2, '.xz': lzma}
+
+# Masque de création des fichiers du processus (lu une fois à l'import,
+# os.umask ne permettant pas de le lire sans le modifier)
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+
+
+def compression_module(path: str):
+    """
+    Module de compression correspondant à l'extension d'un fichier.
+
+    Args:
+        path (str): Chemin du fichier
+
+    Returns:
+        Module gzip, bz2 ou lzma, ou None pour un fichier non compressé
+    """
+    return COMPRESSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def open_text(path: str):
+    """
+    Ouvre un fichier texte en lecture, compressé ou non.
+
+    La décompression se fait en flux pendant la lecture.
+
+    Args:
+        path (str): Chemin du fichier (.csv, .csv.gz, .csv.bz2, .csv.xz)
+
+    Returns:
+        Fichier texte UTF-8
+    """
+    module = compression_module(path)
+    if module is None:
+        return open(path, 'r', encoding='utf-8')
+    return module.open(path, 'rt', encoding='utf-8')
+
+
+def collation_key(text: str) -> Tuple[str, str]:
+    """
+    Clé de tri d'un texte, sans tenir compte de la casse ni des accents.
+
+    « éclair » se range ainsi entre « Durian » et « Figue » au lieu d'après
+    « Zeste » ; le texte exact départage les valeurs de même clé.
+
+    Args:
+        text (str): Texte à trier
+
+    Returns:
+        Tuple[str, str]: Texte sans casse ni accents, puis texte exact
+    """
+    folded = unicodedata.normalize('NFKD', text.casefold())
+    base = ''.join(char for char in folded
+                   if not unicodedata.combining(char))
+    return base, text
+
 
 class InputError(Exception):
     """Exception personnalisée pour les erreurs d'input utilisateur."""
 
 
+class OutputError(Exception):
+    """Erreur d'écriture d'un fichier de sortie."""
+
+
+class ReportAccumulator:
+    """
+    Agrégats du rapport récapitulatif, mis à jour ligne par ligne.
+
+    Permet de calculer les statistiques pendant un parcours en flux des
+    données, sans jamais conserver la liste complète des lignes.
+    """
+
+    def __init__(self, use_numpy: bool = True):
+        """
+        Initialise des agrégats vides.
+
+        Args:
+            use_numpy (bool): Agrège les ProductTable avec NumPy quand il
+                est installé (repli automatique en Python pur sinon)
+        """
+        self.use_numpy = use_numpy and np is not None
+        self.total_items = 0
+        self.total_quantity = 0.0
+        self.total_value = 0.0
+        self.categories: Dict[str, Dict] = {}
+
+    def add(self, row: List[str]) -> None:
+        """
+        Intègre une ligne dans les agrégats.
+
+        Args:
+            row (List[str]): Ligne [nom, quantité, prix, catégorie]
+        """
+        self.add_values(row[0], float(row[1]), float(row[2]), row[3])
+
+    def add_values(self, name: str, qty: float, price: float,
+                   category: str) -> None:
+        """
+        Intègre un article déjà converti dans les agrégats.
+
+        Args:
+            name (str): Nom de l'article
+            qty (float): Quantité
+            price (float): Prix unitaire
+            category (str): Catégorie
+        """
+        value = price * qty
+
+        self.total_items += 1
+        self.total_quantity += qty
+        self.total_value += value
+
+        if category not in self.categories:
+            self.categories[category] = {'quantity': 0,
+                                         'total_value': 0, 'items': []}
+
+        self.categories[category]['quantity'] += qty
+        self.categories[category]['total_value'] += value
+        self.categories[category]['items'].append(name)
+
+    def update(self, rows: Iterable[List[str]],
+               skip_invalid: bool = False) -> None:
+        """
+        Intègre toutes les lignes d'un itérable dans les agrégats.
+
+        Une ProductTable est lue directement dans ses colonnes typées,
+        sans reconvertir les nombres.
+
+        Args:
+            rows (Iterable[List[str]]): Lignes à intégrer
+            skip_invalid (bool): Ignore les lignes dont un nombre est
+                invalide, comme le fait ProductTable.from_rows
+        """
+        if isinstance(rows, TableView) and rows.indices is None:
+            rows = rows.table
+        if isinstance(rows, ProductTable):
+            self.update_table(rows)
+            return
+        for row in rows:
+            try:
+                self.add(row)
+            except ValueError:
+                if not skip_invalid:
+                    raise
+
+    def merge(self, other: 'ReportAccumulator') -> None:
+        """
+        Ajoute les agrégats d'un autre accumulateur à celui-ci.
+
+        Le coût dépend du nombre de catégories (et de la recopie des noms
+        d'articles), pas du nombre de lignes agrégées.
+
+        Args:
+            other (ReportAccumulator): Agrégats à ajouter
+        """
+        self.total_items += other.total_items
+        self.total_quantity += other.total_quantity
+        self.total_value += other.total_value
+        for category, aggregate in other.categories.items():
+            if category not in self.categories:
+                self.categories[category] = {'quantity': 0,
+                                             'total_value': 0, 'items': []}
+            self.categories[category]['quantity'] += aggregate['quantity']
+            self.categories[category]['total_value'] += \
+                aggregate['total_value']
+            self.categories[category]['items'].extend(aggregate['items'])
+
+    def to_dict(self) -> Dict:
+        """
+        Exporte les agrégats dans un dictionnaire sérialisable en JSON.
+
+        Returns:
+            Dict: Totaux et agrégats par catégorie
+        """
+        return {'total_items': self.total_items,
+                'total_quantity': self.total_quantity,
+                'total_value': self.total_value,
+                'categories': self.categories}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ReportAccumulator':
+        """
+        Reconstruit des agrégats exportés par to_dict.
+
+        Args:
+            data (Dict): Agrégats exportés
+
+        Returns:
+            ReportAccumulator: Agrégats reconstruits
+        """
+        stats = cls()
+        stats.total_items = data['total_items']
+        stats.total_quantity = data['total_quantity']
+        stats.total_value = data['total_value']
+        stats.categories = {category: {'quantity': aggregate['quantity'],
+                                       'total_value':
+                                           aggregate['total_value'],
+                                       'items': list(aggregate['items'])}
+                            for category, aggregate
+                            in data['categories'].items()}
+        return stats
+
+    def update_table(self, table: 'ProductTable') -> None:
+        """
+        Intègre une table entière dans les agrégats.
+
+        Avec NumPy, les totaux et les sommes par catégorie sont calculés
+        en lot (regroupement par code de catégorie) ; sinon la table est
+        parcourue ligne par ligne.
+
+        Args:
+            table (ProductTable): Table à intégrer
+        """
+        if not self.use_numpy or not len(table):
+            for name, qty, price, category in table.iter_values():
+                self.add_values(name, qty, price, category)
+            return
+
+        codes_array = table.categories.codes
+        codes = np.frombuffer(codes_array, dtype=f'u{codes_array.itemsize}')
+        quantities = np.frombuffer(table.quantities, dtype=np.float64)
+        values = quantities * np.frombuffer(table.prices, dtype=np.float64)
+
+        self.total_items += len(table)
+        self.total_quantity += float(quantities.sum())
+        self.total_value += float(values.sum())
+
+        # Regroupement par catégorie sur les codes du dictionnaire
+        nb_categories = len(table.categories.values)
+        qty_sums = np.bincount(codes, weights=quantities,
+                               minlength=nb_categories)
+        value_sums = np.bincount(codes, weights=values,
+                                 minlength=nb_categories)
+        counts = np.bincount(codes, minlength=nb_categories)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.concatenate(([0], np.cumsum(counts))).tolist()
+
+        # Noms des articles regroupés par catégorie, dans l'ordre d'origine
+        name_codes_array = table.names.codes
+        name_codes = np.frombuffer(
+            name_codes_array, dtype=f'u{name_codes_array.itemsize}')
+        grouped_names = list(map(table.names.values.__getitem__,
+                                 name_codes[order].tolist()))
+        for code, category in enumerate(table.categories.values):
+            if not counts[code]:
+                continue
+            if category not in self.categories:
+                self.categories[category] = {'quantity': 0,
+                                             'total_value': 0, 'items': []}
+            aggregate = self.categories[category]
+            aggregate['quantity'] += float(qty_sums[code])
+            aggregate['total_value'] += float(value_sums[code])
+            aggregate['items'].extend(
+                grouped_names[bounds[code]:bounds[code + 1]])
+
+    def observe(self, rows: Iterable[List[str]]) -> Iterator[List[str]]:
+        """
+        Laisse passer les lignes tout en les intégrant aux agrégats.
+
+        Comme dans ProductTable.extend, les lignes dont la quantité ou le
+        prix n'est pas un nombre sont ignorées et signalées.
+
+        Args:
+            rows (Iterable[List[str]]): Lignes à observer
+
+        Yields:
+            List[str]: Les lignes valides reçues, inchangées
+        """
+        for row in rows:
+            try:
+                self.add(row)
+            except ValueError:
+                print(f"Ligne {row} ignorée - valeur numérique invalide")
+                continue
+            yield row
+
+
+class TextColumn:
+    """
+    Colonne de texte encodée par dictionnaire.
+
+    Chaque valeur distincte n'est stockée qu'une fois ; la colonne ne
+    contient que des codes entiers compacts renvoyant à ces valeurs.
+    """
+
+    def __init__(self):
+        """Initialise une colonne vide."""
+        self.codes = array('I')
+        self.values: List[str] = []
+        self._lookup: Dict[str, int] = {}
+        self._ranks: Optional[array] = None
+        self._row_ranks: Optional[array] = None
+        self._index: Optional[tuple] = None
+        self._raw_lookup: Dict[bytes, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> str:
+        return self.values[self.codes[index]]
+
+    def append(self, value: str) -> None:
+        """
+        Ajoute une valeur en réutilisant son code si elle est déjà connue.
+
+        Args:
+            value (str): Valeur à ajouter
+        """
+        code = self._lookup.get(value)
+        if code is None:
+            code = len(self.values)
+            self._lookup[value] = code
+            self.values.append(sys.intern(value))
+            self._ranks = None
+        self.codes.append(code)
+
+    def append_raw(self, raw: bytes) -> None:
+        """
+        Ajoute une valeur encore encodée en UTF-8.
+
+        Seules les valeurs jamais vues sont décodées en chaînes Python ;
+        les répétitions ne coûtent qu'une recherche sur les octets bruts.
+
+        Args:
+            raw (bytes): Valeur encodée en UTF-8
+        """
+        code = self._raw_lookup.get(raw)
+        if code is None:
+            self.append(raw.decode('utf-8'))
+            self._raw_lookup[raw] = self.codes[-1]
+        else:
+            self.codes.append(code)
+
+    def release_raw_lookup(self) -> None:
+        """Libère la table de correspondance des valeurs brutes."""
+        self._raw_lookup = {}
+
+    def ranks(self) -> array:
+        """
+        Rang de chaque valeur distincte dans l'ordre de tri.
+
+        L'ordre est celui de collation_key (sans casse ni accents). Trier
+        des lignes par rang d'entier donne le même ordre sans recalculer
+        ni comparer de clés de texte : chaque clé n'est calculée qu'une
+        fois par valeur distincte, puis le rang est conservé tant
+        qu'aucune nouvelle valeur n'est ajoutée.
+
+        Returns:
+            array: Rang indexé par code
+        """
+        if self._ranks is None:
+            ranks = array('I', bytes(4 * len(self.values)))
+            values = self.values
+            order = sorted(range(len(values)),
+                           key=lambda code: collation_key(values[code]))
+            for rank, code in enumerate(order):
+                ranks[code] = rank
+            self._ranks = ranks
+        return self._ranks
+
+    def row_ranks(self) -> array:
+        """
+        Rang de tri de chaque ligne, précalculé.
+
+        C'est la clé de tri de la colonne stockée à côté des codes : les
+        tris et sélections partielles la lisent directement. Recalculée si
+        des lignes ont été ajoutées depuis.
+
+        Returns:
+            array: Rang indexé par ligne
+        """
+        row_ranks = self._row_ranks
+        if (row_ranks is None or len(row_ranks) != len(self.codes)
+                or self._ranks is None):
+            ranks = self.ranks()
+            row_ranks = array('I', map(ranks.__getitem__, self.codes))
+            self._row_ranks = row_ranks
+        return row_ranks
+
+    def build_index(self) -> None:
+        """
+        Construit l'index de hachage insensible à la casse de la colonne.
+
+        Les lignes sont regroupées par valeur normalisée (casefold) dans un
+        unique tableau, avec un tableau de positions de début par valeur :
+        une recherche exacte coûte un accès au dictionnaire puis O(k) pour
+        ses k lignes, quel que soit le nombre total de lignes.
+        """
+        key_ids: Dict[str, int] = {}
+        code_keys = array('L', (key_ids.setdefault(value.casefold(),
+                                                   len(key_ids))
+                                for value in self.values))
+
+        # Tri par dénombrement des lignes selon leur valeur normalisée
+        offsets = array('L', [0]) * (len(key_ids) + 1)
+        for code in self.codes:
+            offsets[code_keys[code] + 1] += 1
+        for key_id in range(len(key_ids)):
+            offsets[key_id + 1] += offsets[key_id]
+        positions = offsets[:-1]
+        rows = array('L', [0]) * len(self.codes)
+        for row, code in enumerate(self.codes):
+            key_id = code_keys[code]
+            rows[positions[key_id]] = row
+            positions[key_id] += 1
+
+        self._index = (len(self.codes), key_ids, offsets, rows)
+
+    def lookup(self, value: str) -> Sequence[int]:
+        """
+        Recherche les lignes dont la valeur est égale, sans tenir compte
+        de la casse.
+
+        L'index est (re)construit si la colonne a changé depuis.
+
+        Args:
+            value (str): Valeur recherchée
+
+        Returns:
+            Sequence[int]: Indices croissants des lignes correspondantes
+        """
+        if self._index is None or self._index[0] != len(self.codes):
+            self.build_index()
+        _, key_ids, offsets, rows = self._index
+        key_id = key_ids.get(value.casefold())
+        if key_id is None:
+            return array('L')
+        return rows[offsets[key_id]:offsets[key_id + 1]]
+
+    def matching_codes(self, predicate: Callable[[str], bool]) -> set:
+        """
+        Évalue un prédicat une seule fois par valeur distincte.
+
+        Args:
+            predicate (Callable[[str], bool]): Test sur une valeur
+
+        Returns:
+            set: Codes des valeurs qui satisfont le prédicat
+        """
+        return {code for code, value in enumerate(self.values)
+                if predicate(value)}
+
+
+class SortedIndex:
+    """
+    Index trié d'une colonne numérique.
+
+    Conserve la permutation des lignes triées par valeur et les valeurs
+    triées correspondantes, pour répondre aux recherches par plage ou par
+    valeur exacte par dichotomie (bisect).
+    """
+
+    def __init__(self, values: array):
+        """
+        Construit l'index.
+
+        Args:
+            values (array): Valeurs de la colonne, indexées par ligne
+        """
+        self.order = array('L', sorted(range(len(values)),
+                                       key=values.__getitem__))
+        self.keys = array('d', map(values.__getitem__, self.order))
+
+    @classmethod
+    def from_arrays(cls, order: Sequence[int],
+                    keys: Sequence[float]) -> 'SortedIndex':
+        """
+        Reprend un index déjà calculé (par exemple relu d'un fichier).
+
+        Args:
+            order (Sequence[int]): Lignes triées par valeur
+            keys (Sequence[float]): Valeurs triées correspondantes
+
+        Returns:
+            SortedIndex: Index sans nouveau tri
+        """
+        index = cls.__new__(cls)
+        index.order = order
+        index.keys = keys
+        return index
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def bounds(self, low: float, high: float) -> Tuple[int, int]:
+        """
+        Positions dans l'index des valeurs comprises dans une plage.
+
+        Args:
+            low (float): Borne minimale incluse
+            high (float): Borne maximale incluse
+
+        Returns:
+            Tuple[int, int]: Début et fin (exclue) de la plage dans l'index
+        """
+        return bisect_left(self.keys, low), bisect_right(self.keys, high)
+
+    def range(self, low: float, high: float) -> array:
+        """
+        Lignes dont la valeur est comprise dans une plage.
+
+        Args:
+            low (float): Borne minimale incluse
+            high (float): Borne maximale incluse
+
+        Returns:
+            array: Indices croissants des lignes correspondantes
+        """
+        start, stop = self.bounds(low, high)
+        return array('L', sorted(self.order[start:stop]))
+
+
+class ProductTable:
+    """
+    Table de produits stockée par colonnes typées.
+
+    Les quantités et les prix sont convertis une seule fois en flottants
+    et rangés dans des tableaux compacts ; le nom et la catégorie sont
+    encodés par dictionnaire. Le texte d'origine des nombres est gardé
+    (encodé par dictionnaire lui aussi) pour réécrire les lignes telles
+    qu'elles ont été lues. Toutes les opérations de tri et de filtrage
+    travaillent sur des tableaux d'indices de lignes (voir TableView).
+    """
+
+    def __init__(self):
+        """Initialise une table vide."""
+        self.names = TextColumn()
+        self.quantities = array('d')
+        self.prices = array('d')
+        self.categories = TextColumn()
+        self.quantity_texts = TextColumn()
+        self.price_texts = TextColumn()
+        self._sorted_indexes: Dict[int, SortedIndex] = {}
+        # Projection mémoire et vues d'une table rechargée par load_binary
+        self._mapping: Optional[mmap.mmap] = None
+        self._views: List[memoryview] = []
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[List[str]]) -> 'ProductTable':
+        """
+        Construit une table à partir de lignes texte.
+
+        Les lignes dont la quantité ou le prix n'est pas un nombre sont
+        ignorées et signalées.
+
+        Args:
+            rows (Iterable[List[str]]): Lignes
+                [nom, quantité, prix, catégorie]
+
+        Returns:
+            ProductTable: Table construite
+        """
+        table = cls()
+        table.extend(rows)
+        return table
+
+    def extend(self, rows: Iterable[List[str]]) -> None:
+        """
+        Ajoute des lignes texte à la table.
+
+        Les lignes dont la quantité ou le prix n'est pas un nombre sont
+        ignorées et signalées.
+
+        Args:
+            rows (Iterable[List[str]]): Lignes
+                [nom, quantité, prix, catégorie]
+        """
+        for row in rows:
+            try:
+                self.append(row)
+            except ValueError:
+                print(f"Ligne {row} ignorée - valeur numérique invalide")
+
+    def __len__(self) -> int:
+        return len(self.quantities)
+
+    def __iter__(self) -> Iterator[List[str]]:
+        return self.take(range(len(self)))
+
+    def append(self, row: List[str]) -> None:
+        """
+        Ajoute une ligne texte à la table.
+
+        Args:
+            row (List[str]): Ligne [nom, quantité, prix, catégorie]
+
+        Raises:
+            ValueError: Si la quantité ou le prix n'est pas un nombre
+        """
+        qty = float(row[1])
+        price = float(row[2])
+        self.names.append(row[0])
+        self.quantities.append(qty)
+        self.prices.append(price)
+        self.categories.append(row[3])
+        self.quantity_texts.append(row[1])
+        self.price_texts.append(row[2])
+
+    def append_raw(self, fields: List[bytes]) -> None:
+        """
+        Ajoute une ligne lue sans décodage (voir MappedCSVReader).
+
+        Les nombres sont convertis directement depuis les octets, les
+        textes ne sont décodés qu'à leur première apparition.
+
+        Args:
+            fields (List[bytes]): Champs [nom, quantité, prix, catégorie]
+
+        Raises:
+            ValueError: Si la quantité ou le prix n'est pas un nombre
+        """
+        qty = float(fields[1])
+        price = float(fields[2])
+        self.names.append_raw(fields[0])
+        self.quantities.append(qty)
+        self.prices.append(price)
+        self.categories.append_raw(fields[3])
+        self.quantity_texts.append_raw(fields[1])
+        self.price_texts.append_raw(fields[2])
+
+    def release_raw_lookups(self) -> None:
+        """Libère les correspondances d'octets bruts après append_raw."""
+        for column in (self.names, self.categories, self.quantity_texts,
+                       self.price_texts):
+            column.release_raw_lookup()
+
+    def row(self, index: int) -> List[str]:
+        """
+        Reconstruit une ligne texte, nombres écrits comme à la lecture.
+
+        Args:
+            index (int): Indice de la ligne
+
+        Returns:
+            List[str]: Ligne [nom, quantité, prix, catégorie]
+        """
+        return [self.names[index], self.quantity_texts[index],
+                self.price_texts[index], self.categories[index]]
+
+    def take(self, indices: Iterable[int]) -> Iterator[List[str]]:
+        """
+        Reconstruit à la demande les lignes texte d'une liste d'indices.
+
+        Args:
+            indices (Iterable[int]): Indices des lignes
+
+        Yields:
+            List[str]: Lignes dans l'ordre des indices
+        """
+        for index in indices:
+            yield self.row(index)
+
+    def iter_values(self) -> Iterator[tuple]:
+        """
+        Parcourt les lignes sous forme typée.
+
+        Yields:
+            tuple: (nom, quantité, prix, catégorie)
+        """
+        names = self.names
+        categories = self.categories
+        for index, (qty, price) in enumerate(zip(self.quantities,
+                                                 self.prices)):
+            yield names[index], qty, price, categories[index]
+
+    def numeric_column(self, column_index: int) -> array:
+        """
+        Renvoie le tableau d'une colonne numérique.
+
+        Args:
+            column_index (int): 1 pour la quantité, 2 pour le prix
+
+        Returns:
+            array: Valeurs flottantes de la colonne
+        """
+        return self.quantities if column_index == 1 else self.prices
+
+    def build_indexes(self) -> None:
+        """
+        Construit les index secondaires et les clés de tri de la table.
+
+        Index de hachage insensibles à la casse et rangs de tri sur le nom
+        et la catégorie, index triés sur la quantité et le prix.
+        """
+        for column in (self.names, self.categories):
+            column.build_index()
+            column.row_ranks()
+        for column_index in [1, 2]:
+            self._sorted_indexes[column_index] = SortedIndex(
+                self.numeric_column(column_index))
+
+    # Format binaire en colonnes : en-tête, description JSON des sections,
+    # puis les tableaux bruts alignés sur 8 octets
+    BINARY_MAGIC = b'CSVMCOL2'
+
+    def save_binary(self, path: str,
+                    inputs: Optional[List[List]] = None) -> None:
+        """
+        Écrit la table dans un fichier binaire en colonnes.
+
+        Les nombres sont écrits en tableaux de flottants de taille fixe,
+        les textes (dont le texte d'origine des nombres) en codes entiers
+        et dictionnaires de valeurs. Les index
+        (rangs de tri, index triés) sont écrits aussi pour ne pas avoir à
+        les recalculer au rechargement. Le fichier est remplacé d'un coup.
+
+        Args:
+            path (str): Chemin du fichier binaire
+            inputs (Optional[List[List]]): Signature des fichiers d'entrée,
+                vérifiée au rechargement
+        """
+        sections: List[Tuple[str, object]] = [
+            ('quantities', self.quantities),
+            ('prices', self.prices),
+        ]
+        for name, column in self._text_sections():
+            text = ''.join(column.values)
+            offsets = array('Q', [0])
+            for value in column.values:
+                offsets.append(offsets[-1] + len(value))
+            sections += [(f'{name}.codes', column.codes),
+                         (f'{name}.offsets', offsets),
+                         (f'{name}.text', text.encode('utf-8'))]
+            if name in ('names', 'categories'):  # Clés de tri
+                sections += [(f'{name}.ranks', column.ranks()),
+                             (f'{name}.row_ranks', column.row_ranks())]
+        for column_index in [1, 2]:
+            index = self.sorted_index(column_index)
+            # Indices en entiers de 8 octets sur toutes les plateformes
+            order = memoryview(index.order)
+            if order.itemsize != 8:
+                order = array('Q', order)
+            elif order.format != 'Q':
+                order = order.cast('B').cast('Q')
+            sections += [(f'sorted{column_index}.order', order),
+                         (f'sorted{column_index}.keys', index.keys)]
+
+        # Position de chaque section, formats et signature dans l'en-tête
+        layout = {}
+        position = 0
+        for name, data in sections:
+            view = memoryview(data)
+            layout[name] = [position, view.nbytes, view.format]
+            position += -(-view.nbytes // 8) * 8
+        meta = json.dumps({'rows': len(self), 'byteorder': sys.byteorder,
+                           'inputs': inputs, 'sections': layout},
+                          ensure_ascii=False).encode('utf-8')
+        header_size = -(-(len(self.BINARY_MAGIC) + 4 + len(meta)) // 8) * 8
+
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as file:
+            file.write(self.BINARY_MAGIC)
+            file.write(struct.pack('<I', len(meta)))
+            file.write(meta)
+            file.write(bytes(header_size - file.tell()))
+            for name, data in sections:
+                view = memoryview(data)
+                file.write(view)
+                file.write(bytes(-view.nbytes % 8))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def read_binary_meta(cls, path: str) -> Optional[Dict]:
+        """
+        Lit l'en-tête d'un fichier binaire de table.
+
+        Args:
+            path (str): Chemin du fichier binaire
+
+        Returns:
+            Optional[Dict]: Description du fichier (nombre de lignes,
+            signature des entrées, sections) ou None s'il est absent ou
+            invalide
+        """
+        try:
+            with open(path, 'rb') as file:
+                if file.read(len(cls.BINARY_MAGIC)) != cls.BINARY_MAGIC:
+                    return None
+                meta_size, = struct.unpack('<I', file.read(4))
+                meta = json.loads(file.read(meta_size).decode('utf-8'))
+        except (OSError, ValueError, struct.error):
+            return None
+        meta['data_start'] = -(-(len(cls.BINARY_MAGIC) + 4 + meta_size)
+                               // 8) * 8
+        return meta
+
+    @classmethod
+    def load_binary(cls, path: str,
+                    inputs: Optional[List[List]] = None
+                    ) -> Optional['ProductTable']:
+        """
+        Recharge une table écrite par save_binary, par projection mémoire.
+
+        Les colonnes et les index sont des vues directes sur le fichier
+        projeté (aucune copie, aucune analyse de texte) ; seuls les
+        dictionnaires de valeurs distinctes sont décodés. La table obtenue
+        est en lecture seule et garde le fichier projeté jusqu'à close().
+
+        Args:
+            path (str): Chemin du fichier binaire
+            inputs (Optional[List[List]]): Signature attendue des fichiers
+                d'entrée ; le fichier est ignoré s'il ne correspond pas
+
+        Returns:
+            Optional[ProductTable]: Table rechargée ou None si le fichier
+            est absent, invalide ou périmé
+        """
+        meta = cls.read_binary_meta(path)
+        if (meta is None or meta['byteorder'] != sys.byteorder
+                or (inputs is not None and meta['inputs'] != inputs)):
+            return None
+
+        with open(path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return None
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        table = cls()
+        table._mapping = buffer
+        data = memoryview(buffer)
+        table._views.append(data)
+        start = meta['data_start']
+
+        def section(name):
+            offset, size, fmt = meta['sections'][name]
+            view = data[start + offset:start + offset + size]
+            table._views.append(view)
+            if fmt != 'B':
+                view = view.cast(fmt)
+                table._views.append(view)
+            return view
+
+        table.quantities = section('quantities')
+        table.prices = section('prices')
+        for name, column in table._text_sections():
+            text = bytes(section(f'{name}.text')).decode('utf-8')
+            offsets = section(f'{name}.offsets')
+            column.values = [text[offsets[code]:offsets[code + 1]]
+                             for code in range(len(offsets) - 1)]
+            column.codes = section(f'{name}.codes')
+            if name in ('names', 'categories'):
+                column._ranks = section(f'{name}.ranks')
+                column._row_ranks = section(f'{name}.row_ranks')
+        for column_index in [1, 2]:
+            table._sorted_indexes[column_index] = SortedIndex.from_arrays(
+                section(f'sorted{column_index}.order'),
+                section(f'sorted{column_index}.keys'))
+        return table
+
+    def _text_sections(self) -> List[Tuple[str, TextColumn]]:
+        """Colonnes de texte du format binaire, avec leur nom de section."""
+        return [('names', self.names), ('categories', self.categories),
+                ('quantity_texts', self.quantity_texts),
+                ('price_texts', self.price_texts)]
+
+    def close(self) -> None:
+        """
+        Libère la projection mémoire d'une table rechargée par load_binary.
+
+        Les vues sur le fichier sont relâchées puis la projection fermée :
+        le fichier binaire peut ensuite être remplacé (impossible sous
+        Windows tant qu'il est projeté). La table redevient vide. Sans
+        effet sur une table construite en mémoire.
+
+        Raises:
+            BufferError: Si un objet extérieur (tableau NumPy, memoryview)
+                utilise encore les données de la table
+        """
+        if self._mapping is None:
+            return
+        views, mapping = self._views, self._mapping
+        self.names = TextColumn()
+        self.quantities = array('d')
+        self.prices = array('d')
+        self.categories = TextColumn()
+        self.quantity_texts = TextColumn()
+        self.price_texts = TextColumn()
+        self._sorted_indexes = {}
+        self._mapping = None
+        self._views = []
+        # Vues dérivées d'abord, la vue sur toute la projection en dernier
+        for view in reversed(views):
+            view.release()
+        mapping.close()
+
+    def __enter__(self) -> 'ProductTable':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def sorted_index(self, column_index: int) -> SortedIndex:
+        """
+        Renvoie l'index trié d'une colonne numérique.
+
+        L'index est (re)construit s'il n'existe pas ou si la table a
+        changé depuis.
+
+        Args:
+            column_index (int): 1 pour la quantité, 2 pour le prix
+
+        Returns:
+            SortedIndex: Index trié de la colonne
+        """
+        index = self._sorted_indexes.get(column_index)
+        if index is None or len(index) != len(self):
+            index = SortedIndex(self.numeric_column(column_index))
+            self._sorted_indexes[column_index] = index
+        return index
+
+    def text_column(self, column_index: int) -> TextColumn:
+        """
+        Renvoie une colonne de texte.
+
+        Args:
+            column_index (int): 0 pour le nom, 3 pour la catégorie
+
+        Returns:
+            TextColumn: Colonne encodée
+        """
+        return self.names if column_index == 0 else self.categories
+
+    def sort_indices(self, indices: Iterable[int], column_index: int,
+                     reverse: bool = False) -> array:
+        """
+        Trie des indices de lignes selon une colonne.
+
+        Les lignes elles-mêmes ne sont ni copiées ni déplacées : seule la
+        permutation d'indices est calculée, à partir des clés précalculées
+        (voir key_column). Avec NumPy, le tri est un argsort stable sur ces
+        clés ; sinon un tri Python stable.
+
+        Args:
+            indices (Iterable[int]): Indices à trier
+            column_index (int): Colonne de tri
+            reverse (bool): Ordre décroissant
+
+        Returns:
+            array: Indices triés
+        """
+        keys = self.key_column(column_index)
+        if np is None or not len(self):
+            return array('L', sorted(indices, key=keys.__getitem__,
+                                     reverse=reverse))
+
+        if isinstance(indices, range):
+            positions = np.arange(indices.start, indices.stop, indices.step)
+        elif isinstance(indices, array):
+            positions = np.frombuffer(indices, dtype=f'u{indices.itemsize}')
+        else:
+            positions = np.fromiter(indices, dtype=np.int64)
+        values = np.asarray(keys)[positions]
+        if reverse:
+            # Clés opposées : ordre décroissant, égalités dans l'ordre
+            # d'entrée comme sorted(reverse=True)
+            values = -values.astype(np.float64)
+        order = positions[np.argsort(values, kind='stable')]
+        result = array('L')
+        result.frombytes(order.astype(f'u{result.itemsize}').tobytes())
+        return result
+
+    def key_column(self, column_index: int) -> array:
+        """
+        Clés de tri précalculées d'une colonne, indexées par ligne.
+
+        Flottants déjà convertis pour les colonnes numériques, rangs de
+        collation (sans casse ni accents) pour les colonnes textuelles.
+
+        Args:
+            column_index (int): Colonne de tri
+
+        Returns:
+            array: Clé de chaque ligne
+        """
+        if column_index in [1, 2]:
+            return self.numeric_column(column_index)
+        return self.text_column(column_index).row_ranks()
+
+    def row_key(self, sort_keys: Sequence[tuple]) -> Callable[[int], object]:
+        """
+        Clé de tri d'un indice de ligne combinant plusieurs colonnes.
+
+        Les valeurs numériques et les rangs des textes sont opposés pour
+        les clés décroissantes : un seul tri croissant (ou une sélection
+        partielle par tas) suffit alors pour toutes les clés.
+
+        Args:
+            sort_keys (Sequence[tuple]): Clés (colonne, décroissant), de la
+                plus à la moins prioritaire
+
+        Returns:
+            Callable[[int], object]: Clé d'un indice de ligne
+        """
+        parts = []
+        for column_index, reverse in sort_keys:
+            values = self.key_column(column_index)
+            if reverse:
+                parts.append(lambda i, values=values: -values[i])
+            else:
+                parts.append(values.__getitem__)
+
+        if len(parts) == 1:
+            return parts[0]
+
+        def key(i):
+            return tuple(part(i) for part in parts)
+        return key
+
+
+class TableView:
+    """
+    Vue sur une ProductTable : sélection et ordre de lignes sans copie.
+
+    La vue ne contient qu'un tableau d'indices (ou rien du tout quand elle
+    couvre toute la table dans l'ordre d'origine) ; les lignes texte ne
+    sont reconstruites qu'à l'affichage ou à l'écriture.
+    """
+
+    def __init__(self, table: ProductTable,
+                 indices: Optional[Sequence[int]] = None):
+        """
+        Initialise une vue.
+
+        Args:
+            table (ProductTable): Table sous-jacente
+            indices (Optional[Sequence[int]]): Lignes de la vue, dans
+                l'ordre ; None pour toute la table
+        """
+        self.table = table
+        self.indices = indices
+
+    def __len__(self) -> int:
+        if self.indices is None:
+            return len(self.table)
+        return len(self.indices)
+
+    def __iter__(self) -> Iterator[List[str]]:
+        return self.table.take(self.row_indices())
+
+    def row_indices(self) -> Sequence[int]:
+        """
+        Renvoie les indices de la vue dans la table.
+
+        Returns:
+            Sequence[int]: Indices des lignes, dans l'ordre de la vue
+        """
+        if self.indices is None:
+            return range(len(self.table))
+        return self.indices
+
+    def page(self, start: int, size: int) -> Iterator[List[str]]:
+        """
+        Reconstruit les lignes d'une page de la vue.
+
+        Args:
+            start (int): Position de la première ligne
+            size (int): Nombre de lignes de la page
+
+        Returns:
+            Iterator[List[str]]: Lignes de la page
+        """
+        return self.table.take(self.row_indices()[start:start + size])
+
+
+class ProductQuery:
+    """
+    Requête paresseuse sur les produits : filtres, tris et limite.
+
+    Les opérations sont seulement enregistrées. execute() les optimise
+    (filtres les moins coûteux d'abord, plages fusionnées par colonne) puis
+    les applique en un seul passage sur la table ; row_predicate() permet
+    de pousser les filtres dans la lecture des fichiers pour écarter les
+    lignes avant même leur conversion.
+    """
+
+    # Coût relatif des filtres : les moins chers sont évalués en premier
+    _FILTER_COST = {'equal': 0, 'range': 1, 'contains': 2}
+
+    # Au-delà de len(table) / _TOP_K_RATIO lignes gardées, un tri complet
+    # redevient plus rapide que la sélection par tas
+    _TOP_K_RATIO = 8
+
+    def __init__(self):
+        """Initialise une requête vide : toutes les lignes, dans l'ordre."""
+        self.filters: List[tuple] = []
+        self.sort_keys: List[tuple] = []
+        self.limit_count: Optional[int] = None
+        self.offset_count = 0
+
+    def where_equal(self, column_index: int, value: str) -> 'ProductQuery':
+        """
+        Ajoute un filtre sur une valeur exacte.
+
+        Les nombres sont comparés en flottants, les textes sans tenir
+        compte de la casse (casefold).
+
+        Args:
+            column_index (int): Colonne filtrée
+            value (str): Valeur recherchée
+
+        Returns:
+            ProductQuery: La requête elle-même, pour chaîner les appels
+
+        Raises:
+            ValueError: Si la valeur d'une colonne numérique n'est pas
+                un nombre
+        """
+        if column_index in [1, 2]:
+            self.filters.append(('equal', column_index, float(value)))
+        else:
+            self.filters.append(('equal', column_index, value.casefold()))
+        return self
+
+    def where_contains(self, column_index: int,
+                       value: str) -> 'ProductQuery':
+        """
+        Ajoute un filtre « contient » sur une colonne texte.
+
+        Args:
+            column_index (int): Colonne textuelle filtrée
+            value (str): Texte recherché, sans tenir compte de la casse
+
+        Returns:
+            ProductQuery: La requête elle-même, pour chaîner les appels
+        """
+        self.filters.append(('contains', column_index, value.casefold()))
+        return self
+
+    def where_range(self, column_index: int, min_val: float,
+                    max_val: float) -> 'ProductQuery':
+        """
+        Ajoute un filtre de plage (bornes incluses) sur une colonne numérique.
+
+        Args:
+            column_index (int): Colonne numérique filtrée
+            min_val (float): Borne minimale
+            max_val (float): Borne maximale
+
+        Returns:
+            ProductQuery: La requête elle-même, pour chaîner les appels
+        """
+        self.filters.append(('range', column_index, (min_val, max_val)))
+        return self
+
+    def order_by(self, column_index: int, reverse: bool = False,
+                 primary: bool = False) -> 'ProductQuery':
+        """
+        Ajoute une clé de tri.
+
+        Args:
+            column_index (int): Colonne de tri
+            reverse (bool): Ordre décroissant
+            primary (bool): Place la clé avant les clés déjà présentes
+                (sinon elle sert à départager les égalités)
+
+        Returns:
+            ProductQuery: La requête elle-même, pour chaîner les appels
+        """
+        key = (column_index, reverse)
+        if primary:
+            self.sort_keys.insert(0, key)
+        else:
+            self.sort_keys.append(key)
+        return self
+
+    def limit(self, count: Optional[int]) -> 'ProductQuery':
+        """
+        Limite le nombre de lignes du résultat.
+
+        Args:
+            count (Optional[int]): Nombre maximal de lignes (None = aucune)
+
+        Returns:
+            ProductQuery: La requête elle-même, pour chaîner les appels
+
+        Raises:
+            ValueError: Si le nombre est négatif
+        """
+        if count is not None and count < 0:
+            raise ValueError(f"limite négative : {count}")
+        self.limit_count = count
+        return self
+
+    def offset(self, start: int) -> 'ProductQuery':
+        """
+        Saute les premières lignes du résultat (pagination avec limit()).
+
+        Args:
+            start (int): Nombre de lignes sautées
+
+        Returns:
+            ProductQuery: La requête elle-même, pour chaîner les appels
+
+        Raises:
+            ValueError: Si le nombre est négatif
+        """
+        if start < 0:
+            raise ValueError(f"décalage négatif : {start}")
+        self.offset_count = start
+        return self
+
+    def stop_index(self) -> Optional[int]:
+        """Indice de fin du résultat (None = jusqu'à la dernière ligne)."""
+        if self.limit_count is None:
+            return None
+        return self.offset_count + self.limit_count
+
+    def _optimized_filters(self) -> List[tuple]:
+        """
+        Prépare les filtres pour l'exécution.
+
+        Les plages d'une même colonne sont fusionnées en une seule et les
+        filtres sont triés du moins au plus coûteux.
+
+        Returns:
+            List[tuple]: Filtres (type, colonne, opérande) optimisés
+        """
+        ranges: Dict[int, tuple] = {}
+        others = []
+        for kind, column_index, operand in self.filters:
+            if kind == 'range':
+                low, high = ranges.get(column_index,
+                                       (float('-inf'), float('inf')))
+                ranges[column_index] = (max(low, operand[0]),
+                                        min(high, operand[1]))
+            else:
+                others.append((kind, column_index, operand))
+        others.extend(('range', column_index, bounds)
+                      for column_index, bounds in ranges.items())
+        return sorted(others, key=lambda f: self._FILTER_COST[f[0]])
+
+    def row_predicate(self) -> Optional[Callable[[List[str]], bool]]:
+        """
+        Construit un prédicat sur les lignes texte brutes.
+
+        Utilisé pour pousser les filtres dans la lecture : les lignes
+        rejetées ne sont jamais converties ni stockées. Les tests sur le
+        texte sont mémorisés par valeur distincte. Une ligne dont un nombre
+        est invalide est laissée passer pour être signalée à la conversion.
+
+        Returns:
+            Optional[Callable[[List[str]], bool]]: Prédicat, ou None si
+            la requête n'a aucun filtre
+        """
+        filters = self._optimized_filters()
+        if not filters:
+            return None
+
+        tests = []
+        for kind, column_index, operand in filters:
+            if kind == 'equal' and column_index in [1, 2]:
+                tests.append((column_index,
+                              lambda text, number=operand:
+                              float(text) == number))
+            elif kind == 'range':
+                tests.append((column_index,
+                              lambda text, bounds=operand:
+                              bounds[0] <= float(text) <= bounds[1]))
+            else:
+                cache: Dict[str, bool] = {}
+                if kind == 'equal':
+                    def test(text, value=operand, cache=cache):
+                        if text not in cache:
+                            cache[text] = text.casefold() == value
+                        return cache[text]
+                else:
+                    def test(text, value=operand, cache=cache):
+                        if text not in cache:
+                            cache[text] = value in text.casefold()
+                        return cache[text]
+                tests.append((column_index, test))
+
+        def predicate(row: List[str]) -> bool:
+            try:
+                return all(test(row[column_index])
+                           for column_index, test in tests)
+            except ValueError:
+                return True
+        return predicate
+
+    def _index_tests(self, table: 'ProductTable',
+                     skip: Optional[tuple] = None) -> List[Callable]:
+        """
+        Construit les tests par indice de ligne sur les colonnes typées.
+
+        Les filtres texte sont évalués une fois par valeur distincte du
+        dictionnaire ; chaque ligne ne coûte ensuite qu'un test
+        d'appartenance.
+
+        Args:
+            table (ProductTable): Table interrogée
+            skip (Optional[tuple]): Filtre déjà satisfait par les lignes
+                candidates (résolu par un index), à ne pas réévaluer
+
+        Returns:
+            List[Callable]: Tests à appliquer dans l'ordre
+        """
+        tests = []
+        for kind, column_index, operand in self._optimized_filters():
+            if (kind, column_index, operand) == skip:
+                continue
+            if column_index in [1, 2]:
+                values = table.numeric_column(column_index)
+                if kind == 'equal':
+                    tests.append(lambda i, values=values, number=operand:
+                                 values[i] == number)
+                else:
+                    low, high = operand
+                    tests.append(lambda i, values=values, low=low,
+                                 high=high: low <= values[i] <= high)
+            else:
+                column = table.text_column(column_index)
+                if kind == 'equal':
+                    codes = column.matching_codes(
+                        lambda text, value=operand: text.casefold() == value)
+                else:
+                    codes = column.matching_codes(
+                        lambda text, value=operand: value in text.casefold())
+                tests.append(lambda i, column_codes=column.codes,
+                             codes=codes: column_codes[i] in codes)
+        return tests
+
+    def _index_candidates(self, table: ProductTable
+                          ) -> Tuple[Optional[Sequence[int]],
+                                     Optional[tuple]]:
+        """
+        Choisit, parmi les filtres indexables, le plus sélectif.
+
+        Les valeurs exactes sur le texte passent par l'index de hachage,
+        les valeurs exactes et plages numériques par l'index trié. Les
+        filtres « contient » ne sont pas indexables.
+
+        Args:
+            table (ProductTable): Table interrogée
+
+        Returns:
+            Tuple[Optional[Sequence[int]], Optional[tuple]]: Indices
+            croissants des lignes candidates et filtre utilisé, ou
+            (None, None) si aucun filtre n'est indexable
+        """
+        best = None
+        best_count = None
+        best_filter = None
+        for kind, column_index, operand in self._optimized_filters():
+            if kind == 'contains':
+                continue
+            current_filter = (kind, column_index, operand)
+            if column_index in [1, 2]:
+                low, high = ((operand, operand) if kind == 'equal'
+                             else operand)
+                index = table.sorted_index(column_index)
+                start, stop = index.bounds(low, high)
+                count = max(0, stop - start)
+                if best_count is None or count < best_count:
+                    best, best_count = (index, low, high), count
+                    best_filter = current_filter
+            else:
+                rows = table.text_column(column_index).lookup(operand)
+                if best_count is None or len(rows) < best_count:
+                    best, best_count = rows, len(rows)
+                    best_filter = current_filter
+
+        if isinstance(best, tuple):
+            index, low, high = best
+            best = index.range(low, high)
+        return best, best_filter
+
+    def _mask(self, table: ProductTable, indices: Iterable[int],
+              skip: Optional[tuple] = None) -> Iterator[bool]:
+        """
+        Masque booléen des lignes retenues, produit à la demande.
+
+        Tous les filtres sont évalués en un seul passage ; le masque n'est
+        jamais matérialisé, ce qui permet d'arrêter le parcours dès que la
+        limite est atteinte.
+
+        Args:
+            table (ProductTable): Table interrogée
+            indices (Iterable[int]): Lignes candidates
+            skip (Optional[tuple]): Filtre déjà satisfait par les candidats
+
+        Yields:
+            bool: True si la ligne correspondante est retenue
+        """
+        tests = self._index_tests(table, skip)
+        for i in indices:
+            yield all(test(i) for test in tests)
+
+    def execute(self, table: ProductTable,
+                apply_filters: bool = True) -> TableView:
+        """
+        Exécute la requête complète sur une table.
+
+        Args:
+            table (ProductTable): Table interrogée
+            apply_filters (bool): False si les filtres ont déjà été
+                poussés dans la lecture de la table
+
+        Returns:
+            TableView: Vue des lignes du résultat, dans l'ordre
+        """
+        filtered = apply_filters and bool(self.filters)
+        stop = self.stop_index()
+        if (not filtered and not self.sort_keys and stop is None
+                and not self.offset_count):
+            return TableView(table)
+
+        selected: Iterable[int] = range(len(table))
+        if filtered:
+            # Les index réduisent les candidats, les autres filtres ne sont
+            # évalués que sur ces lignes
+            candidates, used_filter = self._index_candidates(table)
+            if candidates is not None:
+                selected = candidates
+            selected = compress(selected,
+                                self._mask(table, selected, used_filter))
+        if not self.sort_keys:
+            return TableView(table, array('L', islice(
+                selected, self.offset_count, stop)))
+
+        # Top-K : sélection partielle par tas, en O(n log K) au lieu de
+        # trier toutes les lignes (nsmallest est stable comme sorted)
+        if stop is not None and stop * self._TOP_K_RATIO < len(table):
+            indices = heapq.nsmallest(stop, selected,
+                                      key=table.row_key(self.sort_keys))
+            return TableView(table, array('L',
+                                          indices[self.offset_count:]))
+
+        # Les clés sont appliquées de la moins à la plus prioritaire grâce
+        # à la stabilité du tri
+        indices: Iterable[int] = selected
+        for column_index, reverse in reversed(self.sort_keys):
+            indices = table.sort_indices(indices, column_index, reverse)
+        if stop is not None or self.offset_count:
+            indices = indices[self.offset_count:stop]
+        return TableView(table, indices)
+
+
+class _Descending:
+    """Enveloppe inversant la comparaison d'une valeur (tri décroissant)."""
+
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other: '_Descending') -> bool:
+        return self.value == other.value
+
+    def __lt__(self, other: '_Descending') -> bool:
+        return other.value < self.value
+
+
+class ExternalSorter:
+    """
+    Tri externe de lignes texte, pour des données plus grandes que la RAM.
+
+    Les lignes sont accumulées jusqu'au budget mémoire, triées puis
+    écrites dans un fichier temporaire (un « run ») ; les runs sont
+    ensuite fusionnés en flux avec heapq.merge. Si tout tient dans le
+    budget, aucun fichier n'est écrit.
+    """
+
+    def __init__(self, sort_keys: List[tuple],
+                 memory_budget: int = 64 * 1024 * 1024,
+                 temp_folder: Optional[str] = None):
+        """
+        Prépare le tri.
+
+        Args:
+            sort_keys (List[tuple]): Clés (colonne, décroissant), de la plus
+                à la moins prioritaire, comme ProductQuery.sort_keys
+            memory_budget (int): Taille approximative en octets des lignes
+                gardées en mémoire avant d'écrire un run
+            temp_folder (Optional[str]): Dossier des fichiers temporaires
+                (dossier temporaire du système par défaut)
+        """
+        self.sort_keys = list(sort_keys)
+        self.memory_budget = max(1, memory_budget)
+        self.temp_folder = temp_folder
+        self.runs_written = 0
+
+    def row_key(self) -> Callable[[List[str]], tuple]:
+        """
+        Fonction de clé combinant toutes les clés de tri.
+
+        Les nombres sont comparés en flottants (opposés en décroissant) et
+        les textes par collation_key, comme dans ProductTable.sort_indices ;
+        la clé de chaque texte distinct n'est calculée qu'une fois.
+
+        Returns:
+            Callable[[List[str]], tuple]: Clé d'une ligne
+        """
+        parts = []
+        for column_index, reverse in self.sort_keys:
+            if column_index in [1, 2]:  # Colonnes numériques
+                if reverse:
+                    parts.append(lambda row, i=column_index: -float(row[i]))
+                else:
+                    parts.append(lambda row, i=column_index: float(row[i]))
+                continue
+
+            keys: Dict[str, object] = {}
+
+            def text_key(row, i=column_index, keys=keys, reverse=reverse):
+                text = row[i]
+                key = keys.get(text)
+                if key is None:
+                    if len(keys) >= 65536:  # Mémoire bornée (tri externe)
+                        keys.clear()
+                    key = collation_key(text)
+                    if reverse:
+                        key = _Descending(key)
+                    keys[text] = key
+                return key
+            parts.append(text_key)
+
+        def key(row: List[str]) -> tuple:
+            return tuple(part(row) for part in parts)
+        return key
+
+    def sort(self, rows: Iterable[List[str]],
+             validate: bool = True) -> Iterator[List[str]]:
+        """
+        Trie des lignes en flux.
+
+        Comme dans ProductTable, les lignes dont la quantité ou le prix
+        n'est pas un nombre sont ignorées et signalées.
+
+        Args:
+            rows (Iterable[List[str]]): Lignes [nom, quantité, prix,
+                catégorie]
+            validate (bool): False si les lignes sont déjà passées par
+                _valid_rows
+
+        Yields:
+            List[str]: Lignes dans l'ordre des clés de tri (stable)
+        """
+        key = self.row_key()
+        getsizeof = sys.getsizeof
+        runs = []
+        buffer: List[List[str]] = []
+        used = 0
+        if validate:
+            rows = self._valid_rows(rows)
+        try:
+            for row in rows:
+                buffer.append(row)
+                used += getsizeof(row) + sum(map(getsizeof, row))
+                if used >= self.memory_budget:
+                    runs.append(self._spill(buffer, key))
+                    buffer = []
+                    used = 0
+
+            buffer.sort(key=key)
+            if not runs:
+                yield from buffer
+                return
+            if buffer:
+                runs.append(self._spill(buffer, key))
+                buffer = []
+
+            # Fusion k-way : une seule ligne par run en mémoire
+            for run in runs:
+                run.seek(0)
+            yield from heapq.merge(*(csv.reader(run) for run in runs),
+                                   key=key)
+        finally:
+            for run in runs:
+                run.close()
+
+    def top(self, rows: Iterable[List[str]], count: int,
+            validate: bool = True) -> List[List[str]]:
+        """
+        Premières lignes dans l'ordre de tri, sans trier tout le flux.
+
+        Seules count lignes sont gardées en mémoire (tas de taille count).
+
+        Args:
+            rows (Iterable[List[str]]): Lignes [nom, quantité, prix,
+                catégorie]
+            count (int): Nombre de lignes gardées
+            validate (bool): False si les lignes sont déjà passées par
+                _valid_rows
+
+        Returns:
+            List[List[str]]: Les count premières lignes, dans l'ordre
+        """
+        if validate:
+            rows = self._valid_rows(rows)
+        return heapq.nsmallest(count, rows, key=self.row_key())
+
+    @staticmethod
+    def _valid_rows(rows: Iterable[List[str]]) -> Iterator[List[str]]:
+        """
+        Écarte les lignes que ProductTable refuserait.
+
+        Les lignes dont la quantité ou le prix n'est pas un nombre sont
+        ignorées et signalées ; les autres passent inchangées.
+
+        Args:
+            rows (Iterable[List[str]]): Lignes à vérifier
+
+        Yields:
+            List[str]: Lignes valides
+        """
+        for row in rows:
+            try:
+                float(row[1])
+                float(row[2])
+            except ValueError:
+                print(f"Ligne {row} ignorée - valeur numérique invalide")
+                continue
+            yield row
+
+    def _spill(self, buffer: List[List[str]], key: Callable):
+        """
+        Trie un lot de lignes et l'écrit dans un fichier temporaire.
+
+        Args:
+            buffer (List[List[str]]): Lignes du lot
+            key (Callable): Clé de tri
+
+        Returns:
+            Fichier temporaire contenant le run trié
+        """
+        buffer.sort(key=key)
+        run = tempfile.TemporaryFile('w+', newline='', encoding='utf-8',
+                                     dir=self.temp_folder)
+        csv.writer(run).writerows(buffer)
+        self.runs_written += 1
+        return run
+
+
+class AtomicCSVFile:
+    """
+    Fichier CSV de sortie écrit à côté puis mis en place d'un coup.
+
+    Les lignes sont écrites dans un fichier temporaire au nom unique du
+    même dossier, avec un grand tampon d'écriture, puis os.replace
+    remplace le fichier final : un lecteur voit l'ancien fichier ou le
+    nouveau complet, jamais un fichier absent ou à moitié écrit, et deux
+    écritures simultanées du même fichier ne partagent pas leur fichier
+    temporaire. Un chemin en .gz, .bz2 ou .xz est compressé à la volée.
+    """
+
+    BUFFER_SIZE = 1024 * 1024
+
+    def __init__(self, output_path: str):
+        """
+        Prépare l'écriture.
+
+        Args:
+            output_path (str): Chemin du fichier final
+        """
+        self.output_path = output_path
+        self.temp_path: Optional[str] = None
+        self.file = None
+        self._raw = None
+
+    def open(self):
+        """
+        Crée et ouvre le fichier temporaire.
+
+        Returns:
+            Fichier texte à passer à csv.writer
+        """
+        folder, filename = os.path.split(os.path.abspath(self.output_path))
+        fd, self.temp_path = tempfile.mkstemp(suffix='.tmp',
+                                              prefix=f"{filename}.",
+                                              dir=folder)
+        try:
+            # mkstemp crée le fichier en 0600 : droits habituels à la place
+            os.chmod(self.temp_path, 0o666 & ~_UMASK)
+            module = compression_module(self.output_path)
+            if module is None:
+                self.file = os.fdopen(fd, 'w', newline='', encoding='utf-8',
+                                      buffering=self.BUFFER_SIZE)
+                self._raw = self.file
+            else:
+                self._raw = os.fdopen(fd, 'wb', buffering=self.BUFFER_SIZE)
+                self.file = module.open(self._raw, 'wt', newline='',
+                                        encoding='utf-8')
+        except BaseException:
+            if self._raw is None:
+                os.close(fd)
+            self.abort()
+            raise
+        return self.file
+
+    def commit(self) -> None:
+        """
+        Écrit le tampon sur le disque et remplace le fichier final.
+
+        En cas d'échec, le fichier temporaire est supprimé et l'erreur
+        propagée : le fichier final reste inchangé.
+        """
+        try:
+            if self.file is not self._raw:
+                self.file.close()  # Termine le flux compressé
+            self._raw.flush()
+            os.fsync(self._raw.fileno())
+            self._raw.close()
+            os.replace(self.temp_path, self.output_path)
+        except BaseException:
+            self.abort()
+            raise
+
+    def abort(self) -> None:
+        """Abandonne l'écriture : le fichier final reste inchangé."""
+        for file in (self.file, self._raw):
+            if file is not None:
+                try:
+                    file.close()
+                except (OSError, ValueError):
+                    pass  # Contenu abandonné de toute façon
+        if self.temp_path is not None and os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+
+class MergeCache:
+    """
+    Cache disque de la fusion, indexé par l'empreinte des fichiers d'entrée.
+
+    Le manifeste associe à chaque fichier d'entrée sa taille, sa date de
+    modification et son empreinte SHA-256, ainsi que le fichier de cache
+    contenant ses lignes déjà validées et celui de ses agrégats de
+    rapport. Un fichier dont la taille et la date n'ont pas changé n'est
+    ni relu ni haché ; s'il a été touché sans être modifié, seule son
+    empreinte est recalculée.
+
+    Les lignes sont stockées avec pickle : le dossier de cache ne doit
+    contenir que des fichiers écrits par cette classe.
+    """
+
+    MANIFEST = 'manifest.json'
+    # Version des lignes en cache : un cache d'une autre version est ignoré
+    # (les lignes à nombre invalide n'étaient pas encore écartées en v1)
+    VERSION = 2
+
+    def __init__(self, folder: str):
+        """
+        Ouvre (ou prépare) le cache d'un dossier.
+
+        Args:
+            folder (str): Dossier du cache, créé à la première sauvegarde
+        """
+        self.folder = folder
+        self.manifest: Dict[str, Dict] = {'files': {}, 'outputs': {}}
+        self._dirty = False
+
+        manifest_path = os.path.join(folder, self.MANIFEST)
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as file:
+                manifest = json.load(file)
+            if manifest.get('version', 1) == self.VERSION:
+                self.manifest['files'] = dict(manifest.get('files', {}))
+                self.manifest['outputs'] = dict(manifest.get('outputs', {}))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Cache ignoré - manifeste illisible : {e}")
+
+    @staticmethod
+    def _file_hash(file_path: str) -> str:
+        """
+        Calcule l'empreinte SHA-256 d'un fichier par blocs.
+
+        Args:
+            file_path (str): Chemin du fichier
+
+        Returns:
+            str: Empreinte hexadécimale
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            for block in iter(lambda: file.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def fingerprint(self, file_path: str) -> Dict:
+        """
+        Empreinte actuelle d'un fichier d'entrée.
+
+        Le hachage n'est recalculé que si la taille ou la date de
+        modification diffère de celle enregistrée.
+
+        Args:
+            file_path (str): Chemin du fichier
+
+        Returns:
+            Dict: Taille, date de modification (ns) et SHA-256
+        """
+        stat = os.stat(file_path)
+        entry = self.manifest['files'].get(os.path.basename(file_path))
+        if (entry is not None and entry['size'] == stat.st_size
+                and entry['mtime_ns'] == stat.st_mtime_ns):
+            return {'size': entry['size'], 'mtime_ns': entry['mtime_ns'],
+                    'sha256': entry['sha256']}
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                'sha256': self._file_hash(file_path)}
+
+    def get(self, file_path: str) -> Optional[List[List[str]]]:
+        """
+        Renvoie les lignes en cache d'un fichier s'il n'a pas changé.
+
+        Args:
+            file_path (str): Chemin du fichier d'entrée
+
+        Returns:
+            Optional[List[List[str]]]: Lignes validées, ou None si le
+            fichier est nouveau, modifié ou absent du cache
+        """
+        name = os.path.basename(file_path)
+        entry = self.manifest['files'].get(name)
+        if entry is None:
+            return None
+
+        try:
+            current = self.fingerprint(file_path)
+        except OSError:
+            return None
+        if current['sha256'] != entry['sha256']:
+            return None
+        try:
+            with open(os.path.join(self.folder, entry['data']),
+                      'rb') as file:
+                rows = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+        # Fichier touché mais identique : mémoriser sa nouvelle date
+        if current['mtime_ns'] != entry['mtime_ns']:
+            entry.update(current)
+            self._dirty = True
+        return rows
+
+    def put(self, file_path: str, rows: List[List[str]]) -> None:
+        """
+        Enregistre les lignes validées d'un fichier d'entrée.
+
+        Args:
+            file_path (str): Chemin du fichier d'entrée
+            rows (List[List[str]]): Lignes validées du fichier
+        """
+        try:
+            entry = self.fingerprint(file_path)
+        except OSError:
+            return  # Fichier illisible, déjà signalé à la lecture
+        entry['data'] = f"{entry['sha256']}.v{self.VERSION}.pickle"
+
+        os.makedirs(self.folder, exist_ok=True)
+        data_path = os.path.join(self.folder, entry['data'])
+        if not os.path.exists(data_path):
+            temp_path = f"{data_path}.tmp"
+            with open(temp_path, 'wb') as file:
+                pickle.dump(rows, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, data_path)
+
+        self.manifest['files'][os.path.basename(file_path)] = entry
+        self._dirty = True
+
+    def stats(self, file_path: str,
+              rows: List[List[str]]) -> ReportAccumulator:
+        """
+        Agrégats de rapport d'un fichier d'entrée déjà mis en cache.
+
+        Ils sont calculés une seule fois par contenu de fichier puis
+        relus depuis le cache (fichier JSON à côté des lignes). Pour un
+        fichier absent du cache (illisible), ils sont seulement calculés.
+
+        Args:
+            file_path (str): Chemin du fichier d'entrée
+            rows (List[List[str]]): Lignes validées du fichier, utilisées
+                si les agrégats ne sont pas encore en cache
+
+        Returns:
+            ReportAccumulator: Agrégats du fichier
+        """
+        entry = self.manifest['files'].get(os.path.basename(file_path))
+        if entry is None:
+            stats = ReportAccumulator()
+            stats.update(rows, skip_invalid=True)
+            return stats
+        stats_path = os.path.join(self.folder,
+                                  f"{entry['sha256']}.stats.json")
+        try:
+            with open(stats_path, 'r', encoding='utf-8') as file:
+                return ReportAccumulator.from_dict(json.load(file))
+        except (OSError, ValueError, KeyError):
+            pass
+
+        stats = ReportAccumulator()
+        stats.update(rows, skip_invalid=True)
+        temp_path = f"{stats_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(stats.to_dict(), file, ensure_ascii=False)
+        os.replace(temp_path, stats_path)
+        return stats
+
+    def inputs_signature(self, file_paths: List[str]) -> List[List[str]]:
+        """
+        Signature de l'ensemble des fichiers d'entrée, dans l'ordre.
+
+        Args:
+            file_paths (List[str]): Fichiers d'entrée
+
+        Returns:
+            List[List[str]]: Couples [nom, SHA-256] des fichiers connus
+        """
+        files = self.manifest['files']
+        return [[os.path.basename(path),
+                 files.get(os.path.basename(path), {}).get('sha256', '')]
+                for path in file_paths]
+
+    def output_is_current(self, output_path: str,
+                          file_paths: List[str]) -> bool:
+        """
+        Indique si un fichier fusionné correspond aux entrées actuelles.
+
+        Args:
+            output_path (str): Fichier fusionné
+            file_paths (List[str]): Fichiers d'entrée actuels
+
+        Returns:
+            bool: True s'il a été écrit à partir des mêmes entrées et n'a
+            pas été modifié depuis
+        """
+        entry = self.manifest['outputs'].get(os.path.basename(output_path))
+        if entry is None or not os.path.exists(output_path):
+            return False
+        stat = os.stat(output_path)
+        return (entry['size'] == stat.st_size
+                and entry['mtime_ns'] == stat.st_mtime_ns
+                and entry['inputs'] == self.inputs_signature(file_paths))
+
+    def record_output(self, output_path: str,
+                      file_paths: List[str]) -> None:
+        """
+        Mémorise les entrées ayant produit un fichier fusionné.
+
+        Args:
+            output_path (str): Fichier fusionné écrit
+            file_paths (List[str]): Fichiers d'entrée utilisés
+        """
+        if not os.path.exists(output_path):
+            return
+        stat = os.stat(output_path)
+        self.manifest['outputs'][os.path.basename(output_path)] = {
+            'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+            'inputs': self.inputs_signature(file_paths)}
+        self._dirty = True
+
+    def prune(self, file_paths: List[str]) -> None:
+        """
+        Oublie les fichiers d'entrée disparus et leurs données en cache.
+
+        Args:
+            file_paths (List[str]): Fichiers d'entrée actuels
+        """
+        names = {os.path.basename(path) for path in file_paths}
+        files = self.manifest['files']
+        for name in [name for name in files if name not in names]:
+            del files[name]
+            self._dirty = True
+
+        used = {entry['sha256'] for entry in files.values()}
+        data = {entry['data'] for entry in files.values()}
+        if not os.path.isdir(self.folder):
+            return
+        for filename in os.listdir(self.folder):
+            if ((filename.endswith('.pickle') and filename not in data)
+                    or (filename.endswith('.stats.json')
+                        and filename.split('.', 1)[0] not in used)):
+                os.remove(os.path.join(self.folder, filename))
+
+    def save(self) -> None:
+        """Écrit le manifeste s'il a changé (remplacement atomique)."""
+        if not self._dirty:
+            return
+        os.makedirs(self.folder, exist_ok=True)
+        manifest_path = os.path.join(self.folder, self.MANIFEST)
+        temp_path = f"{manifest_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(dict(self.manifest, version=self.VERSION), file,
+                      ensure_ascii=False, indent=1)
+        os.replace(temp_path, manifest_path)
+        self._dirty = False
+
+
+class MappedCSVReader:
+    """
+    Lecteur CSV sur un fichier projeté en mémoire (mmap).
+
+    Les fins de ligne sont repérées directement dans le tampon du fichier
+    et chaque champ est copié en octets, sans être décodé en chaîne Python.
+    Une ligne contenant des guillemets est confiée au module csv ; si un
+    champ entre guillemets continue sur la ligne suivante (nombre impair
+    de guillemets), tout le reste du fichier est lu par le module csv.
+    """
+
+    def __init__(self, file_path: str, nb_columns: int = 4):
+        """
+        Prépare la lecture d'un fichier.
+
+        Args:
+            file_path (str): Chemin du fichier CSV
+            nb_columns (int): Nombre de colonnes attendu
+        """
+        self.file_path = file_path
+        self.nb_columns = nb_columns
+        self.line_num = 0  # Numéro de la dernière ligne lue
+
+    def __iter__(self) -> Iterator[List[bytes]]:
+        """
+        Parcourt les lignes de données valides du fichier.
+
+        Même validation que CSVMerger._iter_file_rows : en-tête et lignes
+        à nb_columns colonnes, lignes invalides signalées avec leur numéro
+        (line_num donne celui de la dernière ligne renvoyée).
+
+        Yields:
+            List[bytes]: Champs bruts de chaque ligne de données
+        """
+        filename = os.path.basename(self.file_path)
+        try:
+            file = open(self.file_path, 'rb')
+        except OSError as e:
+            print(f"Fichier {filename} ignoré - illisible : {e}")
+            return
+        with file:
+            if os.fstat(file.fileno()).st_size == 0:
+                print(f"Fichier {filename} ignoré - structure invalide")
+                return
+            with mmap.mmap(file.fileno(), 0,
+                           access=mmap.ACCESS_READ) as buffer:
+                yield from self._scan(buffer, filename)
+
+    def _scan(self, buffer: mmap.mmap,
+              filename: str) -> Iterator[List[bytes]]:
+        """
+        Valide les enregistrements du tampon.
+
+        Args:
+            buffer (mmap.mmap): Contenu du fichier
+            filename (str): Nom du fichier pour les messages
+
+        Yields:
+            List[bytes]: Champs bruts de chaque ligne de données
+        """
+        header_seen = False
+        for line_num, fields in self._records(buffer):
+            if not header_seen:
+                if len(fields) != self.nb_columns:
+                    print(f"Fichier {filename} ignoré - structure invalide")
+                    return
+                header_seen = True
+            elif len(fields) == self.nb_columns:
+                self.line_num = line_num
+                yield fields
+            elif fields:
+                print(f"Ligne {line_num} du fichier {filename}"
+                      f" ignorée - {len(fields)} colonnes au lieu de"
+                      f" {self.nb_columns}")
+
+    def _records(self, buffer: mmap.mmap) -> Iterator[Tuple[int, List[bytes]]]:
+        """
+        Découpe le tampon en lignes puis en champs.
+
+        Args:
+            buffer (mmap.mmap): Contenu du fichier
+
+        Yields:
+            Tuple[int, List[bytes]]: Numéro de la (dernière) ligne du
+            fichier et champs bruts de chaque enregistrement
+        """
+        size = len(buffer)
+        position = 3 if buffer[:3] == b'\xef\xbb\xbf' else 0
+        line_num = 0
+
+        while position < size:
+            end = buffer.find(b'\n', position)
+            if end == -1:
+                end = size
+            line = buffer[position:end].rstrip(b'\r')
+            line_num += 1
+
+            if b'"' not in line:
+                fields = line.split(b',') if line else []
+            elif line.count(b'"') % 2:
+                # Champ entre guillemets sur plusieurs lignes : la suite
+                # du fichier est lue par le module csv, décodée comme par
+                # open_text
+                with open(self.file_path, 'rb') as raw:
+                    raw.seek(position)
+                    reader = csv.reader(io.TextIOWrapper(raw,
+                                                         encoding='utf-8'))
+                    for row in reader:
+                        yield (line_num - 1 + reader.line_num,
+                               [field.encode('utf-8') for field in row])
+                return
+            else:
+                fields = [field.encode('utf-8') for field in
+                          next(csv.reader([line.decode('utf-8')]), [])]
+            position = end + 1
+            yield line_num, fields
+
+
+def _load_csv_file(file_path: str) -> List[List[str]]:
+    """
+    Lit entièrement un fichier CSV validé, sans son en-tête.
+
+    Fonction de module afin de pouvoir être exécutée dans un pool de
+    processus (elle doit être sérialisable par pickle).
+
+    Args:
+        file_path (str): Chemin du fichier CSV
+
+    Returns:
+        List[List[str]]: Lignes du fichier (vide si structure invalide)
+    """
+    return list(CSVMerger._iter_file_rows(file_path))
+
+
 class CSVMerger:
     """
     Classe de fusion et de tri avancée de fichiers CSV multi-plateforme.
@@ -17,10 +2173,24 @@ class CSVMerger:
     avec des fonctionnalités interactives étendues.
     """
 
+    # Taille des lots de lignes et nombre de lots en attente entre deux
+    # étapes du pipeline asynchrone (mémoire bornée)
+    PIPELINE_CHUNK_SIZE = 2000
+    PIPELINE_QUEUE_SIZE = 8
+
     def __init__(self,
                  input_folder: str = 'CSV-init',
                  output_folder: str = 'CSV-core',
-                 sort_folder: str = 'CSV-sort'):
+                 sort_folder: str = 'CSV-sort',
+                 workers: int = 1,
+                 use_processes: bool = False,
+                 page_size: int = 20,
+                 use_cache: bool = False,
+                 cache_folder: str = 'CSV-cache',
+                 use_mmap: bool = False,
+                 use_pipeline: bool = False,
+                 binary_output: bool = False,
+                 compression: Optional[str] = None):
         """
         Initialise le fusionneur de CSV avec des dossiers personnalisés.
 
@@ -28,11 +2198,54 @@ class CSVMerger:
             input_folder (str): Nom du dossier source des CSV
             output_folder (str): Nom du dossier de destination principale
             sort_folder (str): Nom du dossier pour les CSV triés
+            workers (int): Nombre de fichiers lus en parallèle
+                (1 = lecture séquentielle)
+            use_processes (bool): Utilise un pool de processus plutôt
+                qu'un pool de threads pour la lecture parallèle
+            page_size (int): Nombre de lignes affichées par page
+            use_cache (bool): Réutilise les fichiers déjà lus lors d'une
+                exécution précédente s'ils n'ont pas changé
+            cache_folder (str): Nom du dossier du cache de fusion
+            use_mmap (bool): Construit la table fusionnée directement
+                depuis les fichiers projetés en mémoire, sans décoder
+                chaque champ en chaîne Python
+            use_pipeline (bool): Fusionne avec le pipeline asynchrone
+                (lecture, écriture et construction de la table en
+                parallèle) au lancement interactif
+            binary_output (bool): Écrit aussi la table fusionnée au format
+                binaire en colonnes et la recharge par projection mémoire
+                tant que les fichiers d'entrée n'ont pas changé
+            compression (Optional[str]): Compresse les fichiers écrits
+                dans les dossiers de sortie et de tri ('gz', 'bz2' ou
+                'xz', None pour des CSV non compressés)
+
+        Raises:
+            ValueError: Si la compression demandée n'est pas reconnue
         """
         self.base_dir = self._get_base_path()
         self.input_folder = os.path.join(self.base_dir, input_folder)
         self.output_folder = os.path.join(self.base_dir, output_folder)
         self.sort_folder = os.path.join(self.base_dir, sort_folder)
+        self.workers = max(1, workers)
+        self.use_processes = use_processes
+        self.page_size = max(1, page_size)
+        self.use_mmap = use_mmap
+        self.use_pipeline = use_pipeline
+        self.binary_output = binary_output
+        if compression is not None and f'.{compression}' not in COMPRESSIONS:
+            raise ValueError(f"Compression inconnue : {compression}")
+        self.compression = compression
+        self.cache = (MergeCache(os.path.join(self.base_dir, cache_folder))
+                      if use_cache else None)
+
+        # Agrégats du rapport maintenus pendant la fusion (avec le cache)
+        # et mémorisés pour la dernière table analysée
+        self.merge_stats: Optional[ReportAccumulator] = None
+        self._report_cache: Optional[tuple] = None
+
+        # Dernière table rechargée du fichier binaire : elle le garde
+        # projeté en mémoire jusqu'à close_binary()
+        self._binary_table: Optional[ProductTable] = None
 
         # Définition des colonnes avec leurs index
         self.columns = {
@@ -68,117 +2281,749 @@ class CSVMerger:
             print(f"Erreur lors de la création des répertoires : {e}")
             sys.exit(1)
 
+    def _list_csv_files(self) -> List[str]:
+        """
+        Liste les fichiers CSV du dossier d'entrée dans un ordre stable.
+
+        Les fichiers compressés (.csv.gz, .csv.bz2, .csv.xz) sont inclus.
+
+        Returns:
+            List[str]: Chemins complets des fichiers CSV, triés par nom
+        """
+        extensions = ('.csv',) + tuple(f'.csv{suffix}'
+                                       for suffix in COMPRESSIONS)
+        return [os.path.join(self.input_folder, filename)
+                for filename in sorted(os.listdir(self.input_folder))
+                if filename.lower().endswith(extensions)]
+
     @staticmethod
-    def _validate_csv_file(file_path: str) -> bool:
+    def _iter_file_rows(file_path: str) -> Iterator[List[str]]:
         """
-        Vérifie la structure du fichier CSV.
+        Lit un fichier CSV ligne par ligne en validant sa structure.
+
+        Le fichier n'est ouvert et décodé qu'une seule fois : l'en-tête doit
+        avoir 4 colonnes, sinon le fichier est ignoré ; chaque ligne de
+        données doit aussi avoir 4 colonnes et une quantité et un prix
+        numériques, sinon elle est ignorée et signalée avec son numéro de
+        ligne. Les lignes valides sont renvoyées telles qu'elles ont été
+        lues. Un fichier illisible est signalé et ignoré.
 
         Args:
-            file_path (str): Chemin du fichier CSV
+            file_path (str): Chemin du fichier CSV, éventuellement compressé
 
-        Returns:
-            bool: True si le fichier a le bon format, False sinon
+        Yields:
+            List[str]: Lignes de données valides du fichier
         """
+        filename = os.path.basename(file_path)
         try:
-            with open(file_path, 'r', encoding='utf-8') as csvfile:
-                reader = csv.reader(csvfile)
-                first_row = next(reader)
-                return len(first_row) == 4
-        except Exception as e:
-            print(f"Erreur lors de la validation du fichier {file_path}: {e}")
-            return False
+            file = open_text(file_path)
+        except OSError as e:
+            print(f"Fichier {filename} ignoré - illisible : {e}")
+            return
+        with file:
+            reader = csv.reader(file)
+
+            # Valider l'en-tête
+            try:
+                header = next(reader, None)
+            except Exception as e:
+                print(f"Erreur lors de la validation du fichier"
+                      f" {file_path}: {e}")
+                header = None
+            if header is None or len(header) != 4:
+                print(f"Fichier {filename} ignoré - structure invalide")
+                return
+
+            # Valider chaque ligne pendant la lecture
+            for row in reader:
+                if len(row) != 4:
+                    if row:
+                        print(f"Ligne {reader.line_num} du fichier"
+                              f" {filename} ignorée - {len(row)} colonnes"
+                              f" au lieu de 4")
+                    continue
+                try:
+                    float(row[1])
+                    float(row[2])
+                except ValueError:
+                    print(f"Ligne {reader.line_num} du fichier {filename}"
+                          f" ignorée - valeur numérique invalide")
+                    continue
+                yield row
+
+    def iter_merged_rows(self,
+                         workers: Optional[int] = None
+                         ) -> Iterator[List[str]]:
+        """
+        Parcourt en flux les lignes de tous les fichiers CSV d'entrée.
+
+        En mode séquentiel, les fichiers sont lus l'un après l'autre : la
+        mémoire utilisée ne dépend pas du volume total des données. En mode
+        parallèle, au plus deux fichiers par worker sont en mémoire, et les
+        lignes sont restituées dans l'ordre des fichiers. Avec le cache,
+        seuls les fichiers nouveaux ou modifiés sont relus.
+
+        Args:
+            workers (Optional[int]): Nombre de fichiers lus en parallèle,
+                par défaut celui donné au constructeur
+
+        Yields:
+            List[str]: Lignes fusionnées, fichier par fichier
+        """
+        workers = self.workers if workers is None else workers
+        file_paths = self._list_csv_files()
+
+        if self.cache is None and (workers <= 1 or len(file_paths) <= 1):
+            for file_path in file_paths:
+                yield from self._iter_file_rows(file_path)
+            return
+
+        # Avec le cache, les agrégats de chaque fichier sont relus ou
+        # calculés une fois puis cumulés au fil de la fusion
+        self.merge_stats = None
+        totals = ReportAccumulator() if self.cache is not None else None
+        try:
+            for rows in self._iter_file_batches(file_paths, workers, totals):
+                yield from rows
+        finally:
+            if self.cache is not None:
+                self.cache.prune(file_paths)
+                self.cache.save()
+        self.merge_stats = totals
+
+    def _iter_file_batches(self, file_paths: List[str], workers: int,
+                           totals: Optional[ReportAccumulator] = None
+                           ) -> Iterator[List[List[str]]]:
+        """
+        Lit les fichiers un par un ou en parallèle, en passant par le cache.
+
+        Les fichiers présents dans le cache ne sont pas relus ; les autres
+        sont lus (dans un pool si workers > 1) puis ajoutés au cache.
+
+        Args:
+            file_paths (List[str]): Fichiers à lire, dans l'ordre
+            workers (int): Nombre de fichiers lus en parallèle
+            totals (Optional[ReportAccumulator]): Agrégats auxquels
+                ajouter ceux de chaque fichier (cache activé uniquement)
 
-    def merge_csv_files(self) -> Optional[List[List[str]]]:
+        Yields:
+            List[List[str]]: Lignes de chaque fichier, dans l'ordre
+        """
+        pool = None
+        if workers > 1 and len(file_paths) > 1:
+            pool_class = (ProcessPoolExecutor if self.use_processes
+                          else ThreadPoolExecutor)
+            pool = pool_class(max_workers=workers)
+
+        def start(file_path):
+            if self.cache is not None:
+                rows = self.cache.get(file_path)
+                if rows is not None:
+                    return file_path, rows, True
+            if pool is None:
+                return file_path, _load_csv_file(file_path), False
+            return file_path, pool.submit(_load_csv_file, file_path), False
+
+        try:
+            # Fenêtre bornée de fichiers en cours de lecture
+            remaining = iter(file_paths)
+            window = workers * 2 if pool is not None else 1
+            pending = deque(start(file_path)
+                            for file_path in islice(remaining, window))
+            while pending:
+                file_path, rows, cached = pending.popleft()
+                if isinstance(rows, Future):
+                    rows = rows.result()
+                if self.cache is not None:
+                    if not cached:
+                        self.cache.put(file_path, rows)
+                    if totals is not None:
+                        totals.merge(self.cache.stats(file_path, rows))
+                next_path = next(remaining, None)
+                if next_path is not None:
+                    pending.append(start(next_path))
+                yield rows
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def output_file(self, folder: str, filename: str) -> str:
+        """
+        Chemin d'un fichier de sortie, avec l'extension de compression.
+
+        Args:
+            folder (str): Dossier de sortie ou de tri
+            filename (str): Nom du fichier CSV (avec .csv)
+
+        Returns:
+            str: Chemin complet, suivi de .gz/.bz2/.xz si demandé
+        """
+        if self.compression is not None:
+            filename = f"{filename}.{self.compression}"
+        return os.path.join(folder, filename)
+
+    def merged_output_path(self, language: str = 'fr') -> str:
+        """
+        Chemin du fichier fusionné du dossier de sortie.
+
+        Args:
+            language (str): Langue du nom de fichier ('fr' ou 'en')
+
+        Returns:
+            str: Chemin complet du fichier fusionné
+        """
+        output_filename = ('produits_fusionnes.csv' if language == 'fr'
+                           else 'merged_products.csv')
+        return self.output_file(self.output_folder, output_filename)
+
+    def _binary_path(self) -> str:
+        """Chemin du fichier binaire de la table fusionnée."""
+        return os.path.join(self.output_folder, 'produits_fusionnes.bin')
+
+    def _inputs_signature(self) -> List[List]:
+        """
+        Signature légère des fichiers d'entrée (nom, taille, date).
+
+        Returns:
+            List[List]: [nom, taille, date de modification] par fichier
+        """
+        signature = []
+        for file_path in self._list_csv_files():
+            info = os.stat(file_path)
+            signature.append([os.path.basename(file_path), info.st_size,
+                              info.st_mtime_ns])
+        return signature
+
+    def load_merged_binary(self) -> Optional[ProductTable]:
+        """
+        Recharge la table fusionnée depuis son fichier binaire.
+
+        La table rechargée précédemment est fermée : elle est remplacée
+        par la nouvelle.
+
+        Returns:
+            Optional[ProductTable]: Table en lecture seule, ou None si le
+            fichier est absent ou si les fichiers d'entrée ont changé
+        """
+        table = ProductTable.load_binary(self._binary_path(),
+                                         self._inputs_signature())
+        if table is not None:
+            self.close_binary()
+            self._binary_table = table
+        return table
+
+    def close_binary(self) -> None:
+        """
+        Ferme la table rechargée du fichier binaire et libère le fichier.
+
+        Les vues obtenues de cette table deviennent vides.
+        """
+        table = self._binary_table
+        if table is None:
+            return
+        self._binary_table = None
+        if self._report_cache is not None and self._report_cache[0] is table:
+            self._report_cache = None
+        table.close()
+
+    def write_merged_binary(self, table: ProductTable) -> None:
+        """
+        Écrit la table fusionnée au format binaire si nécessaire.
+
+        Le fichier n'est pas réécrit s'il correspond déjà aux fichiers
+        d'entrée actuels. Sinon, la table rechargée précédemment est
+        fermée avant que le fichier ne soit remplacé.
+
+        Args:
+            table (ProductTable): Table fusionnée
+        """
+        if table is self._binary_table:
+            return  # Relue de ce fichier : déjà à jour
+        path = self._binary_path()
+        inputs = self._inputs_signature()
+        meta = ProductTable.read_binary_meta(path)
+        if (meta is not None and meta['inputs'] == inputs
+                and meta['rows'] == len(table)):
+            return
+        self.close_binary()
+        table.save_binary(path, inputs)
+
+    def merge_csv_files(self,
+                        workers: Optional[int] = None
+                        ) -> Optional[List[List[str]]]:
         """
         Fusionne les fichiers CSV du dossier d'entrée.
 
+        Args:
+            workers (Optional[int]): Nombre de fichiers lus en parallèle,
+                par défaut celui donné au constructeur
+
         Returns:
             Optional[List[List[str]]]: Liste
             des données fusionnées ou None en cas d'erreur
         """
-        merged_data: List[List[str]] = []
-
         # Vérifier l'existence du dossier d'entrée
         if not os.path.exists(self.input_folder):
             print(f"Erreur : Le dossier {self.input_folder} n'existe pas.")
             return None
 
-        # Parcourir tous les fichiers CSV du dossier
         try:
-            for filename in os.listdir(self.input_folder):
-                # Utiliser os.path.join pour la compatibilité des chemins
-                file_path = os.path.join(self.input_folder, filename)
+            merged_data: List[List[str]] = list(
+                self.iter_merged_rows(workers))
+        except Exception as e:
+            print(f"Erreur lors de la lecture des fichiers CSV: {e}")
+            return None
+        return merged_data
 
-                # Vérifier que c'est bien un fichier CSV
-                if not filename.lower().endswith('.csv'):
-                    continue
+    def merge_csv_table(self,
+                        workers: Optional[int] = None,
+                        query: Optional[ProductQuery] = None
+                        ) -> Optional[ProductTable]:
+        """
+        Fusionne les fichiers CSV du dossier d'entrée en table typée.
 
-                if not self._validate_csv_file(file_path):
-                    print(f"Fichier {filename} ignoré - structure invalide")
-                    continue
+        Les lignes sont converties au fil de la lecture, sans construire
+        de liste intermédiaire de lignes texte. Les filtres d'une requête
+        éventuelle sont appliqués pendant la lecture.
 
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    reader = csv.reader(file)
-                    # Ignorer l'en-tête du premier fichier
-                    next(reader, None)
-                    for row in reader:
-                        merged_data.append(row)
+        Args:
+            workers (Optional[int]): Nombre de fichiers lus en parallèle,
+                par défaut celui donné au constructeur
+            query (Optional[ProductQuery]): Requête dont les filtres sont
+                poussés dans la lecture
 
+        Returns:
+            Optional[ProductTable]: Table des données fusionnées
+            ou None en cas d'erreur
+        """
+        if not os.path.exists(self.input_folder):
+            print(f"Erreur : Le dossier {self.input_folder} n'existe pas.")
+            return None
+
+        # Table binaire à jour : rechargement sans relire les CSV
+        if self.binary_output and query is None:
+            table = self.load_merged_binary()
+            if table is not None:
+                return table
+
+        try:
+            if self.use_mmap and query is None and self.cache is None:
+                table = self._mapped_table()
+            else:
+                rows = self.iter_merged_rows(workers)
+                predicate = (query.row_predicate() if query is not None
+                             else None)
+                if predicate is not None:
+                    rows = filter(predicate, rows)
+                table = ProductTable.from_rows(rows)
         except Exception as e:
             print(f"Erreur lors de la lecture des fichiers CSV: {e}")
             return None
-        return merged_data
+
+        # Index secondaires pour les filtres répétés, inutiles quand la
+        # table ne sert qu'au résultat d'une requête déjà filtrée
+        if query is None:
+            table.build_indexes()
+            if self.merge_stats is not None:
+                self._report_cache = (table, len(table), self.merge_stats)
+        return table
+
+    def _mapped_table(self) -> ProductTable:
+        """
+        Construit la table fusionnée à partir des fichiers projetés en
+        mémoire.
+
+        Les nombres sont convertis directement depuis les octets du
+        fichier et seules les valeurs de texte distinctes sont décodées.
+
+        Returns:
+            ProductTable: Table des données fusionnées
+        """
+        table = ProductTable()
+        for file_path in self._list_csv_files():
+            if compression_module(file_path) is not None:
+                # Pas de projection possible : décompression en flux
+                table.extend(self._iter_file_rows(file_path))
+                continue
+            reader = MappedCSVReader(file_path)
+            for fields in reader:
+                try:
+                    table.append_raw(fields)
+                except ValueError:
+                    print(f"Ligne {reader.line_num} du fichier"
+                          f" {os.path.basename(file_path)} ignorée -"
+                          f" valeur numérique invalide")
+        table.release_raw_lookups()
+        return table
+
+    def merge_pipeline(self, language: str = 'fr',
+                       sorted_outputs: Optional[Dict[str,
+                                                     ProductQuery]] = None,
+                       workers: Optional[int] = None
+                       ) -> Optional[ProductTable]:
+        """
+        Fusionne, écrit et trie avec un pipeline asynchrone.
+
+        La lecture des fichiers d'entrée, la construction de la table et
+        l'écriture du fichier fusionné avancent en même temps, reliées par
+        des files bornées : sur un dossier lent (réseau), la durée totale
+        est celle de l'étape la plus lente et non leur somme. Les fichiers
+        triés sont ensuite écrits en parallèle, pendant que l'écriture du
+        fichier fusionné se termine.
+
+        Args:
+            language (str): Langue des noms de fichier et des en-têtes
+            sorted_outputs (Optional[Dict[str, ProductQuery]]): Fichiers
+                triés à écrire (chemin complet -> requête)
+            workers (Optional[int]): Nombre de fichiers lus en parallèle
+
+        Returns:
+            Optional[ProductTable]: Table des données fusionnées
+            ou None en cas d'erreur
+        """
+        if not os.path.exists(self.input_folder):
+            print(f"Erreur : Le dossier {self.input_folder} n'existe pas.")
+            return None
+
+        try:
+            return asyncio.run(self._merge_pipeline(
+                language, sorted_outputs or {}, workers))
+        except OutputError as e:
+            print(f"Erreur lors de l'écriture des fichiers de sortie: {e}")
+            return None
+        except Exception as e:
+            print(f"Erreur lors de la lecture des fichiers CSV: {e}")
+            return None
+
+    async def _merge_pipeline(self, language: str,
+                              sorted_outputs: Dict[str, ProductQuery],
+                              workers: Optional[int]) -> ProductTable:
+        """
+        Étapes du pipeline de merge_pipeline.
+
+        Args:
+            language (str): Langue des noms de fichier et des en-têtes
+            sorted_outputs (Dict[str, ProductQuery]): Fichiers triés
+            workers (Optional[int]): Nombre de fichiers lus en parallèle
+
+        Returns:
+            ProductTable: Table des données fusionnées
+
+        Raises:
+            OutputError: Si un fichier de sortie n'a pas pu être écrit
+        """
+        output_path = self.merged_output_path(language)
+        cache = self.cache
+        file_paths = self._list_csv_files() if cache is not None else []
+        write_output = (cache is None or
+                        not cache.output_is_current(output_path, file_paths))
+        if not write_output:
+            if language == 'fr':
+                print(f"Fichier inchangé : {output_path}")
+            else:
+                print(f"File unchanged : {output_path}")
+
+        to_table: asyncio.Queue = asyncio.Queue(self.PIPELINE_QUEUE_SIZE)
+        to_writer: asyncio.Queue = asyncio.Queue(self.PIPELINE_QUEUE_SIZE)
+
+        async def read() -> None:
+            # Chaque lot est lu dans un thread, la boucle reste libre
+            rows = self.iter_merged_rows(workers)
+            while True:
+                chunk = await asyncio.to_thread(
+                    list, islice(rows, self.PIPELINE_CHUNK_SIZE))
+                if not chunk:
+                    break
+                await to_table.put(chunk)
+            await to_table.put(None)
+
+        async def write() -> None:
+            chunk = await to_writer.get()
+            while chunk == []:
+                chunk = await to_writer.get()
+            if chunk is None:
+                if os.path.exists(output_path):
+                    os.remove(output_path)
+                print("Aucune donnée à écrire." if language == 'fr'
+                      else "No data to write")
+                return
+
+            output = AtomicCSVFile(output_path)
+            try:
+                writer = csv.writer(await asyncio.to_thread(output.open))
+                writer.writerow(['Nom', 'Quantité', 'Prix', 'Catégorie']
+                                if language == 'fr'
+                                else ['Name', 'Quantity', 'Price',
+                                      'Category'])
+                while chunk is not None:
+                    await asyncio.to_thread(writer.writerows, chunk)
+                    chunk = await to_writer.get()
+                # Un échec de la mise en place interrompt aussi le pipeline
+                await asyncio.to_thread(output.commit)
+            except Exception as e:
+                await asyncio.to_thread(output.abort)
+                raise OutputError(f"{output_path} : {e}") from e
+            except BaseException:
+                await asyncio.to_thread(output.abort)
+                raise
+            print(f"Fichier créé : {output_path}" if language == 'fr'
+                  else f"File Created : {output_path}")
+
+            if cache is not None:
+                cache.record_output(output_path, file_paths)
+                cache.save()
+
+        async def build() -> ProductTable:
+            # Les lignes écrites sont celles de la table (texte d'origine,
+            # lignes invalides écartées), comme write_merged
+            table = ProductTable()
+            while True:
+                chunk = await to_table.get()
+                if chunk is None:
+                    break
+                start = len(table)
+                table.extend(chunk)
+                if write_output:
+                    await to_writer.put(list(table.take(range(start,
+                                                              len(table)))))
+            if write_output:
+                await to_writer.put(None)
+            table.build_indexes()
+            if self.merge_stats is not None:
+                self._report_cache = (table, len(table), self.merge_stats)
+
+            # Les fichiers triés sont écrits pendant que le fichier
+            # fusionné se termine
+            write_csv = (self.write_csv if language == 'fr'
+                         else self.write_csv_en)
+            outputs = [asyncio.to_thread(write_csv, query.execute(table),
+                                         path)
+                       for path, query in sorted_outputs.items()]
+            if self.binary_output:
+                outputs.append(asyncio.to_thread(self.write_merged_binary,
+                                                 table))
+            try:
+                await asyncio.gather(*outputs)
+            except OSError as e:
+                raise OutputError(e) from e
+            return table
+
+        # Une erreur dans une étape interrompt tout le pipeline
+        stages = [read(), write()] if write_output else [read()]
+        *_, table = await asyncio.gather(*stages, build())
+        return table
+
+    def select(self, query: ProductQuery,
+               workers: Optional[int] = None) -> Optional[TableView]:
+        """
+        Exécute une requête directement sur les fichiers d'entrée.
+
+        Les filtres sont appliqués pendant la lecture, seuls les tris et
+        la limite restent à exécuter sur la table obtenue.
+
+        Args:
+            query (ProductQuery): Requête à exécuter
+            workers (Optional[int]): Nombre de fichiers lus en parallèle
+
+        Returns:
+            Optional[TableView]: Vue du résultat ou None en cas d'erreur
+        """
+        if self.binary_output and os.path.exists(self.input_folder):
+            table = self.load_merged_binary()
+            if table is not None:
+                return query.execute(table)
+
+        table = self.merge_csv_table(workers, query)
+        if table is None:
+            return None
+        return query.execute(table, apply_filters=False)
+
+    def iter_sorted_external(self, query: ProductQuery,
+                             memory_budget: int = 64 * 1024 * 1024
+                             ) -> Iterator[List[str]]:
+        """
+        Exécute une requête en tri externe, sans charger toutes les lignes.
+
+        Les lignes invalides sont écartées dès la lecture, comme pour la
+        table en mémoire ; les lignes filtrées sont ensuite triées par
+        ExternalSorter dans la limite du budget mémoire.
+        Avec une limite, seules les lignes du résultat sont gardées (top-K)
+        et aucun fichier temporaire n'est écrit.
+
+        Args:
+            query (ProductQuery): Requête à exécuter
+            memory_budget (int): Octets de lignes gardés en mémoire
+
+        Returns:
+            Iterator[List[str]]: Lignes du résultat, dans l'ordre
+        """
+        # Lignes déjà validées par _iter_file_rows
+        rows = self.iter_merged_rows()
+        predicate = query.row_predicate()
+        if predicate is not None:
+            rows = filter(predicate, rows)
+        stop = query.stop_index()
+        if query.sort_keys:
+            sorter = ExternalSorter(query.sort_keys, memory_budget)
+            if stop is not None:
+                return iter(sorter.top(rows, stop, validate=False)
+                            [query.offset_count:])
+            rows = sorter.sort(rows, validate=False)
+        return islice(rows, query.offset_count, stop)
+
+    def merge_csv_stream(self,
+                         output_path: Optional[str] = None,
+                         language: str = 'fr',
+                         report: bool = False
+                         ) -> Optional[ReportAccumulator]:
+        """
+        Fusionne les CSV en flux directement vers le fichier de sortie.
+
+        Les lignes passent une à une de la lecture à l'écriture (et aux
+        agrégats du rapport), sans construire la liste complète. Elles sont
+        validées comme pour la table fusionnée : le fichier écrit est
+        identique à celui de write_merged.
+
+        Args:
+            output_path (Optional[str]): Fichier de sortie, par défaut le
+                fichier fusionné du dossier de sortie
+            language (str): Langue de l'en-tête et du rapport ('fr'/'en')
+            report (bool): Génère aussi le rapport récapitulatif
+
+        Returns:
+            Optional[ReportAccumulator]: Agrégats calculés pendant la
+            fusion ou None en cas d'erreur
+        """
+        if not os.path.exists(self.input_folder):
+            print(f"Erreur : Le dossier {self.input_folder} n'existe pas.")
+            return None
+
+        if output_path is None:
+            output_path = self.merged_output_path(language)
+
+        stats = ReportAccumulator()
+        rows = stats.observe(self.iter_merged_rows())
+        try:
+            if language == 'fr':
+                self.write_csv(rows, output_path)
+            else:
+                self.write_csv_en(rows, output_path)
+        except Exception as e:
+            print(f"Erreur lors de la lecture des fichiers CSV: {e}")
+            return None
+
+        if report:
+            if language == 'fr':
+                self.generate_csv_report([], stats)
+            else:
+                self.generate_csv_report_en([], stats)
+        return stats
+
+    def write_merged(self, data: Iterable[List[str]],
+                     language: str = 'fr') -> str:
+        """
+        Écrit le fichier fusionné du dossier de sortie.
+
+        Avec le cache, le fichier n'est pas réécrit s'il a déjà été
+        produit à partir des mêmes fichiers d'entrée. Avec binary_output,
+        une table est aussi écrite au format binaire en colonnes.
+
+        Args:
+            data (Iterable[List[str]]): Données fusionnées
+            language (str): Langue du nom de fichier et de l'en-tête
+
+        Returns:
+            str: Chemin du fichier fusionné
+        """
+        output_path = self.merged_output_path(language)
+
+        if self.binary_output and isinstance(data, ProductTable):
+            self.write_merged_binary(data)
+
+        cache = self.cache
+        file_paths = self._list_csv_files() if cache is not None else []
+        if cache is not None and cache.output_is_current(output_path,
+                                                         file_paths):
+            if language == 'fr':
+                print(f"Fichier inchangé : {output_path}")
+            else:
+                print(f"File unchanged : {output_path}")
+            return output_path
+
+        if language == 'fr':
+            self.write_csv(data, output_path)
+        else:
+            self.write_csv_en(data, output_path)
+
+        if cache is not None:
+            cache.record_output(output_path, file_paths)
+            cache.save()
+        return output_path
 
     @staticmethod
-    def write_csv(data: List[List[str]], output_path: str) -> None:
+    def write_csv(data: Iterable[List[str]], output_path: str) -> None:
         """
         Écrit les données dans un fichier CSV.
 
+        Le fichier est écrit en flux dans un fichier temporaire puis mis
+        en place d'un coup (voir AtomicCSVFile) : l'ancien fichier reste
+        lisible jusqu'au remplacement.
+
         Args:
-            data (List[List[str]]): Données à écrire
+            data (Iterable[List[str]]): Données à écrire, liste ou flux
             output_path (str): Chemin complet du fichier de sortie
         """
-        # Supprimer le fichier existant si nécessaire
-        if os.path.exists(output_path):
-            os.remove(output_path)
+        # Lire la première ligne pour savoir s'il y a des données
+        rows = iter(data)
+        first_row = next(rows, None)
 
         # Écrire le fichier CSV
-        if data:
-            with open(output_path, 'w', newline='',
-                      encoding='utf-8') as csvfile:
+        if first_row is not None:
+            with AtomicCSVFile(output_path) as csvfile:
                 writer = csv.writer(csvfile)
                 # Réajouter l'en-tête
                 writer.writerow(['Nom', 'Quantité', 'Prix', 'Catégorie'])
-                writer.writerows(data)
+                writer.writerow(first_row)
+                writer.writerows(rows)
 
             print(f"Fichier créé : {output_path}")
         else:
+            # Pas de données : l'ancien fichier n'a plus lieu d'être
+            if os.path.exists(output_path):
+                os.remove(output_path)
             print("Aucune donnée à écrire.")
 
     @staticmethod
-    def write_csv_en(data: List[List[str]], output_path: str) -> None:
+    def write_csv_en(data: Iterable[List[str]], output_path: str) -> None:
         """
         Écrit les données dans un fichier CSV.
 
+        Le fichier est écrit en flux dans un fichier temporaire puis mis
+        en place d'un coup (voir AtomicCSVFile) : l'ancien fichier reste
+        lisible jusqu'au remplacement.
+
         Args:
-            data (List[List[str]]): Données à écrire
+            data (Iterable[List[str]]): Données à écrire, liste ou flux
             output_path (str): Chemin complet du fichier de sortie
         """
-        # Supprimer le fichier existant si nécessaire
-        if os.path.exists(output_path):
-            os.remove(output_path)
+        # Lire la première ligne pour savoir s'il y a des données
+        rows = iter(data)
+        first_row = next(rows, None)
 
         # Écrire le fichier CSV
-        if data:
-            with open(output_path, 'w', newline='',
-                      encoding='utf-8') as csvfile:
+        if first_row is not None:
+            with AtomicCSVFile(output_path) as csvfile:
                 writer = csv.writer(csvfile)
                 # Réajouter l'en-tête
                 writer.writerow(['Name', 'Quantity', 'Price', 'Category'])
-                writer.writerows(data)
+                writer.writerow(first_row)
+                writer.writerows(rows)
 
             print(f"File Created : {output_path}")
         else:
+            # Pas de données : l'ancien fichier n'a plus lieu d'être
+            if os.path.exists(output_path):
+                os.remove(output_path)
             print("No data to write")
 
     @staticmethod
@@ -255,22 +3100,58 @@ class CSVMerger:
             except Exception as e:
                 print(f"\nErreur occured : {e}")
 
+    def _display_rows(self, view: TableView, language: str = 'fr') -> None:
+        """
+        Affiche une vue page par page plutôt qu'en entier.
+
+        Seules les lignes de la page courante sont reconstruites.
+
+        Args:
+            view (TableView): Lignes à afficher
+            language (str): Langue des messages ('fr' ou 'en')
+        """
+        total = len(view)
+        for start in range(0, total, self.page_size):
+            for row in view.page(start, self.page_size):
+                print(row)
+
+            shown = min(start + self.page_size, total)
+            if shown >= total:
+                break
+            if language == 'fr':
+                prompt = (f"-- {shown}/{total} lignes -- Entrée : page"
+                          " suivante, q : arrêter l'affichage ")
+            else:
+                prompt = (f"-- {shown}/{total} rows -- Enter: next page,"
+                          " q: stop displaying ")
+            if input(prompt).strip().lower() == 'q':
+                break
+
     def advanced_sort_method(self,
-                             data:
-                             List[List[str]]) -> Optional[List[List[str]]]:
+                             data: Iterable[List[str]]
+                             ) -> Optional[TableView]:
         """
         Méthode de tri avancée avec options de filtrage détaillées.
 
+        Les tris et filtres successifs s'enchaînent dans une ProductQuery,
+        exécutée en une fois sur les colonnes typées d'une ProductTable.
+        Le résultat est une vue (permutation d'indices) : aucune ligne
+        n'est copiée, et l'affichage se fait page par page.
+
         Args:
-            data (List[List[str]]): Données originales à trier
+            data (Iterable[List[str]]): Données originales à trier,
+                idéalement déjà sous forme de ProductTable
 
         Returns:
-            Optional[List[List[str]]]: Données triées ou None
+            Optional[TableView]: Vue des données triées ou None
         """
-        # MODIFICATION CLÉE : Créer une copie des données ORIGINALES
-        # au lieu de modifier les données à chaque itération
-        original_data = data.copy()
-        current_data = original_data.copy()
+        table = (data if isinstance(data, ProductTable)
+                 else ProductTable.from_rows(data))
+
+        # Les opérations s'accumulent dans la requête, les données
+        # ORIGINALES ne sont jamais modifiées
+        query = ProductQuery()
+        current_data = TableView(table)
 
         while True:
             # Afficher les options de colonnes
@@ -279,19 +3160,39 @@ class CSVMerger:
                 print(f"{i}. {col.capitalize()}")
             print("5. Terminer le tri et sauvegarder")
             print("6. Retour au menu principal")
+            print("7. Réinitialiser les tris et filtres")
+            print("8. Limiter le nombre de lignes (les N premières)")
 
             # Obtenir le choix de la colonne avec validation
             try:
                 choix_colonne = self._get_validated_input(
-                    "Entrez votre choix (1-6) : ",
-                    ['1', '2', '3', '4', '5', '6'],
-                    "Veuillez entrer un nombre entre 1 et 6."
+                    "Entrez votre choix (1-8) : ",
+                    ['1', '2', '3', '4', '5', '6', '7', '8'],
+                    "Veuillez entrer un nombre entre 1 et 8."
                 )
 
                 # Option de retour au menu principal
                 if choix_colonne == '6':
                     return None
 
+                # Repartir des données d'origine
+                if choix_colonne == '7':
+                    query = ProductQuery()
+                    current_data = TableView(table)
+                    print("Tris et filtres réinitialisés.")
+                    continue
+
+                # Ne garder que les N premières lignes (top-K) : seules
+                # ces lignes sont sélectionnées, sans tri complet
+                if choix_colonne == '8':
+                    nombre = input("Nombre de lignes à garder"
+                                   " (vide : toutes) : ").strip()
+                    query.limit(int(nombre) if nombre else None)
+                    current_data = query.execute(table)
+                    print("\n--- Données filtrées/triées ---")
+                    self._display_rows(current_data)
+                    continue
+
                 # Option de sauvegarde finale
                 if choix_colonne == '5':
                     # Demander un nom de fichier pour la sauvegarde
@@ -309,8 +3210,8 @@ class CSVMerger:
                                              " CSV (sans extension)" +
                                              " : ").strip()
                             if filename:
-                                output_path = os.path.join(self.sort_folder,
-                                                           f"{filename}.csv")
+                                output_path = self.output_file(
+                                    self.sort_folder, f"{filename}.csv")
                                 self.write_csv(current_data, output_path)
                                 break
                             print("Le nom de fichier ne peut pas être vide.")
@@ -345,16 +3246,8 @@ class CSVMerger:
                     )
                     reverse = choix_ordre == '2'
 
-                    # Trier les données
-                    if column_index in [1, 2]:  # Colonnes numériques
-                        current_data = sorted(current_data,
-                                              key=lambda x:
-                                              float(x[column_index]),
-                                              reverse=reverse)
-                    else:  # Colonnes textuelles
-                        current_data = sorted(current_data,
-                                              key=lambda x: x[column_index],
-                                              reverse=reverse)
+                    # Le dernier tri choisi devient la clé principale
+                    query.order_by(column_index, reverse, primary=True)
 
                 else:  # Filtrage
                     if column_index in [1, 2]:  # Colonnes numériques
@@ -372,18 +3265,15 @@ class CSVMerger:
                         if choix_numerique == '1':
                             # Filtrage par valeur exacte
                             valeur = input(f"Entrez la {column_name}"
-                                           + " exacte à rechercher : ").strip()
-                            current_data = [row for row in current_data if
-                                            row[column_index] == valeur]
+                                           " exacte à rechercher : ").strip()
+                            query.where_equal(column_index, valeur)
                         else:
                             # Filtrage par plage de valeurs
                             min_val = float(input(f"Entrez la {column_name}" +
                                                   " minimale : ").strip())
                             max_val = float(input(f"Entrez la {column_name}" +
                                                   " maximale : ").strip())
-                            current_data = [row for row in current_data if
-                                            min_val <= float
-                                            (row[column_index]) <= max_val]
+                            query.where_range(column_index, min_val, max_val)
 
                     else:  # Colonnes textuelles (nom ou catégorie)
                         print("\nChoisissez le type de filtrage :")
@@ -403,20 +3293,18 @@ class CSVMerger:
 
                         if choix_texte == '1':
                             # Filtrage par valeur exacte
-                            current_data = [row for row in current_data if
-                                            row[column_index].lower()
-                                            == valeur]
+                            query.where_equal(column_index, valeur)
                         else:
                             # Filtrage par contenu
-                            current_data = [row for row in current_data if
-                                            valeur in
-                                            row[column_index].lower()]
+                            query.where_contains(column_index, valeur)
+
+                # Exécuter en une fois l'ensemble des opérations
+                current_data = query.execute(table)
 
                 # Afficher les données filtrées/triées
                 if current_data:
                     print("\n--- Données filtrées/triées ---")
-                    for row in current_data:
-                        print(row)
+                    self._display_rows(current_data)
                 else:
                     print("Aucune donnée ne correspond aux critères.")
 
@@ -424,26 +3312,32 @@ class CSVMerger:
                 print(f"\nErreur de conversion : {e}")
             except Exception as e:
                 print(f"\nUne erreur inattendue s'est produite : {e}")
-
-            original_data = data.copy()
-            current_data = original_data.copy()
     
     def advanced_sort_method_en(self,
-                             data:
-                             List[List[str]]) -> Optional[List[List[str]]]:
+                             data: Iterable[List[str]]
+                             ) -> Optional[TableView]:
         """
         Méthode de tri avancée avec options de filtrage détaillées.
 
+        Les tris et filtres successifs s'enchaînent dans une ProductQuery,
+        exécutée en une fois sur les colonnes typées d'une ProductTable.
+        Le résultat est une vue (permutation d'indices) : aucune ligne
+        n'est copiée, et l'affichage se fait page par page.
+
         Args:
-            data (List[List[str]]): Données originales à trier
+            data (Iterable[List[str]]): Données originales à trier,
+                idéalement déjà sous forme de ProductTable
 
         Returns:
-            Optional[List[List[str]]]: Données triées ou None
+            Optional[TableView]: Vue des données triées ou None
         """
-        # MODIFICATION CLÉE : Créer une copie des données ORIGINALES
-        # au lieu de modifier les données à chaque itération
-        original_data = data.copy()
-        current_data = original_data.copy()
+        table = (data if isinstance(data, ProductTable)
+                 else ProductTable.from_rows(data))
+
+        # Les opérations s'accumulent dans la requête, les données
+        # ORIGINALES ne sont jamais modifiées
+        query = ProductQuery()
+        current_data = TableView(table)
 
         while True:
             # Afficher les options de colonnes
@@ -452,19 +3346,39 @@ class CSVMerger:
                 print(f"{i}. {col.capitalize()}")
             print("5. End sort and register")
             print("6. Back to main menu")
+            print("7. Reset sorts and filters")
+            print("8. Limit the number of rows (first N)")
 
             # Obtenir le choix de la colonne avec validation
             try:
                 choix_colonne = self._get_validated_input(
-                    "Enter your choice (1-6) : ",
-                    ['1', '2', '3', '4', '5', '6'],
-                    "Please enter a number between 1 and 6"
+                    "Enter your choice (1-8) : ",
+                    ['1', '2', '3', '4', '5', '6', '7', '8'],
+                    "Please enter a number between 1 and 8"
                 )
 
                 # Option de retour au menu principal
                 if choix_colonne == '6':
                     return None
 
+                # Repartir des données d'origine
+                if choix_colonne == '7':
+                    query = ProductQuery()
+                    current_data = TableView(table)
+                    print("Sorts and filters reset.")
+                    continue
+
+                # Ne garder que les N premières lignes (top-K) : seules
+                # ces lignes sont sélectionnées, sans tri complet
+                if choix_colonne == '8':
+                    nombre = input("Number of rows to keep"
+                                   " (empty: all) : ").strip()
+                    query.limit(int(nombre) if nombre else None)
+                    current_data = query.execute(table)
+                    print("\n--- Filtered/sorted data ---")
+                    self._display_rows(current_data, 'en')
+                    continue
+
                 # Option de sauvegarde finale
                 if choix_colonne == '5':
                     # Demander un nom de fichier pour la sauvegarde
@@ -482,8 +3396,8 @@ class CSVMerger:
                                              " CSV (sans extension)" +
                                              " : ").strip()
                             if filename:
-                                output_path = os.path.join(self.sort_folder,
-                                                           f"{filename}.csv")
+                                output_path = self.output_file(
+                                    self.sort_folder, f"{filename}.csv")
                                 self.write_csv(current_data, output_path)
                                 break
                             print("Filename cannot be blank")
@@ -518,16 +3432,8 @@ class CSVMerger:
                     )
                     reverse = choix_ordre == '2'
 
-                    # Trier les données
-                    if column_index in [1, 2]:  # Colonnes numériques
-                        current_data = sorted(current_data,
-                                              key=lambda x:
-                                              float(x[column_index]),
-                                              reverse=reverse)
-                    else:  # Colonnes textuelles
-                        current_data = sorted(current_data,
-                                              key=lambda x: x[column_index],
-                                              reverse=reverse)
+                    # Le dernier tri choisi devient la clé principale
+                    query.order_by(column_index, reverse, primary=True)
 
                 else:  # Filtrage
                     if column_index in [1, 2]:  # Colonnes numériques
@@ -545,18 +3451,15 @@ class CSVMerger:
                         if choix_numerique == '1':
                             # Filtrage par valeur exacte
                             valeur = input(f"Entrez la {column_name}"
-                                           + " exacte à rechercher : ").strip()
-                            current_data = [row for row in current_data if
-                                            row[column_index] == valeur]
+                                           " exacte à rechercher : ").strip()
+                            query.where_equal(column_index, valeur)
                         else:
                             # Filtrage par plage de valeurs
                             min_val = float(input(f"Entrez la {column_name}" +
                                                   " minimale : ").strip())
                             max_val = float(input(f"Entrez la {column_name}" +
                                                   " maximale : ").strip())
-                            current_data = [row for row in current_data if
-                                            min_val <= float
-                                            (row[column_index]) <= max_val]
+                            query.where_range(column_index, min_val, max_val)
 
                     else:  # Colonnes textuelles (nom ou catégorie)
                         print("\nChoose type of filtering :")
@@ -576,20 +3479,18 @@ class CSVMerger:
 
                         if choix_texte == '1':
                             # Filtrage par valeur exacte
-                            current_data = [row for row in current_data if
-                                            row[column_index].lower()
-                                            == valeur]
+                            query.where_equal(column_index, valeur)
                         else:
                             # Filtrage par contenu
-                            current_data = [row for row in current_data if
-                                            valeur in
-                                            row[column_index].lower()]
+                            query.where_contains(column_index, valeur)
+
+                # Exécuter en une fois l'ensemble des opérations
+                current_data = query.execute(table)
 
                 # Afficher les données filtrées/triées
                 if current_data:
                     print("\n--- Données filtrées/triées ---")
-                    for row in current_data:
-                        print(row)
+                    self._display_rows(current_data, 'en')
                 else:
                     print("Aucune donnée ne correspond aux critères.")
 
@@ -598,16 +3499,43 @@ class CSVMerger:
             except Exception as e:
                 print(f"\nUne erreur inattendue s'est produite : {e}")
 
-            original_data = data.copy()
-            current_data = original_data.copy()
+    def report_stats(self, data: Iterable[List[str]]) -> ReportAccumulator:
+        """
+        Agrégats du rapport pour des données, sans recalcul inutile.
+
+        Pour la table issue de la dernière fusion, les agrégats maintenus
+        pendant la fusion (cache) ou déjà calculés lors d'un rapport
+        précédent sont réutilisés : produire un nouveau rapport ne coûte
+        alors que le nombre de catégories.
 
-    def generate_csv_report(self, data: List[List[str]]) -> None:
+        Args:
+            data (Iterable[List[str]]): Données à analyser
+
+        Returns:
+            ReportAccumulator: Agrégats des données
+        """
+        cached = self._report_cache
+        if (cached is not None and data is cached[0]
+                and len(data) == cached[1]):
+            return cached[2]
+
+        stats = ReportAccumulator()
+        stats.update(data)
+        if isinstance(data, ProductTable):
+            self._report_cache = (data, len(data), stats)
+        return stats
+
+    def generate_csv_report(self, data: Iterable[List[str]],
+                            stats: Optional[ReportAccumulator] = None
+                            ) -> None:
         """
         Génère un rapport récapitulatif des données CSV
          et l'exporte dans un fichier txt.
 
         Args:
-            data (List[List[str]]): Données à analyser pour le rapport
+            data (Iterable[List[str]]): Données à analyser pour le rapport
+            stats (Optional[ReportAccumulator]): Agrégats déjà calculés,
+                auquel cas data est ignoré
         """
         # Créer le dossier de récapitulatif s'il n'existe pas
         recap_folder = os.path.join(self.base_dir, 'CSV-recap')
@@ -620,30 +3548,17 @@ class CSVMerger:
 
         # Calculs pour le rapport
         try:
-            # Conversion des données numériques
-            quantities = [float(row[1]) for row in data]
-            prices = [float(row[2]) for row in data]
+            # Agrégats maintenus, ou un seul passage sur les données
+            if stats is None:
+                stats = self.report_stats(data)
 
             # Statistiques générales
-            total_items = len(data)
-            total_quantity = sum(quantities)
-            total_value = sum(price * quantity for price, quantity in
-                              zip(prices, quantities))
+            total_items = stats.total_items
+            total_quantity = stats.total_quantity
+            total_value = stats.total_value
 
             # Analyse par catégorie
-            categories = {}
-            for row in data:
-                category = row[3]
-                qty = float(row[1])
-                value = float(row[2]) * qty
-
-                if category not in categories:
-                    categories[category] = {'quantity': 0,
-                                            'total_value': 0, 'items': []}
-
-                categories[category]['quantity'] += qty
-                categories[category]['total_value'] += value
-                categories[category]['items'].append(row[0])
+            categories = stats.categories
 
             # Rédaction du rapport
             with open(filepath, 'w', encoding='utf-8') as report_file:
@@ -676,13 +3591,17 @@ class CSVMerger:
         except Exception as e:
             print(f"Erreur lors de la génération du rapport : {e}")
 
-    def generate_csv_report_en(self, data: List[List[str]]) -> None:
+    def generate_csv_report_en(self, data: Iterable[List[str]],
+                               stats: Optional[ReportAccumulator] = None
+                               ) -> None:
         """
         Génère un rapport récapitulatif des données CSV
          et l'exporte dans un fichier txt.
 
         Args:
-            data (List[List[str]]): Données à analyser pour le rapport
+            data (Iterable[List[str]]): Données à analyser pour le rapport
+            stats (Optional[ReportAccumulator]): Agrégats déjà calculés,
+                auquel cas data est ignoré
         """
         # Créer le dossier de récapitulatif s'il n'existe pas
         recap_folder = os.path.join(self.base_dir, 'CSV-recap')
@@ -695,30 +3614,17 @@ class CSVMerger:
 
         # Calculs pour le rapport
         try:
-            # Conversion des données numériques
-            quantities = [float(row[1]) for row in data]
-            prices = [float(row[2]) for row in data]
+            # Agrégats maintenus, ou un seul passage sur les données
+            if stats is None:
+                stats = self.report_stats(data)
 
             # Statistiques générales
-            total_items = len(data)
-            total_quantity = sum(quantities)
-            total_value = sum(price * quantity for price, quantity in
-                              zip(prices, quantities))
+            total_items = stats.total_items
+            total_quantity = stats.total_quantity
+            total_value = stats.total_value
 
             # Analyse par catégorie
-            categories = {}
-            for row in data:
-                category = row[3]
-                qty = float(row[1])
-                value = float(row[2]) * qty
-
-                if category not in categories:
-                    categories[category] = {'quantity': 0,
-                                            'total_value': 0, 'items': []}
-
-                categories[category]['quantity'] += qty
-                categories[category]['total_value'] += value
-                categories[category]['items'].append(row[0])
+            categories = stats.categories
 
             # Rédaction du rapport
             with open(filepath, 'w', encoding='utf-8') as report_file:
@@ -767,29 +3673,26 @@ class CSVMerger:
             print(f"{error_msg}{e}")
             sys.exit(1)
 
-        # Merge CSV files
-        merged_data = self.merge_csv_files()
+        # Merge CSV files into a typed table, shared by every later stage
+        if self.use_pipeline:
+            # Reading, writing and table building overlap
+            merged_data = self.merge_pipeline(language)
+        else:
+            merged_data = self.merge_csv_table()
 
         if merged_data is None:
             error_msg = "Erreur lors de la fusion des fichiers CSV." if language == 'fr' else "Error merging CSV files."
             print(error_msg)
             sys.exit(1)
 
-        # Writing and displaying data
-        output_filename = 'produits_fusionnes.csv' if language == 'fr' else 'merged_products.csv'
-        merged_output_path = os.path.join(self.output_folder, output_filename)
-        
-        # Use appropriate write method based on language
-        if language == 'fr':
-            self.write_csv(merged_data, merged_output_path)
-        else:
-            self.write_csv_en(merged_data, merged_output_path)
+        # Writing (skipped when the cached output is still current)
+        if not self.use_pipeline:
+            self.write_merged(merged_data, language)
 
         # Display header based on language
         header = "\n--- Données fusionnées ---" if language == 'fr' else "\n--- Merged Data ---"
         print(header)
-        for row in merged_data:
-            print(row)
+        self._display_rows(TableView(merged_data), language)
 
         # Main menu loop
         while True:
@@ -841,3 +3744,6 @@ class CSVMerger:
             except Exception as e:
                 error_msg = "Une erreur s'est produite : " if language == 'fr' else "An error occurred: "
                 print(f"{error_msg}{e}")
+
+        # Release the mapped binary file before exiting
+        self.close_binary()
@@ -1,22 +1,274 @@
-from class_csv import CSVMerger
+import argparse
+import csv
+import os
+import sys
+from typing import Tuple
 
+from class_csv import CSVMerger, ProductQuery
 
-if __name__ == "__main__":
-    import argparse
-    
-    # Create argument parser
-    parser = argparse.ArgumentParser(description='CSV Merger with language support')
-    parser.add_argument(
-        '--lang', 
-        type=str, 
-        choices=['fr', 'en'], 
+
+# Alias sans accents acceptés pour les noms de colonnes en ligne de commande
+COLUMN_ALIASES = {
+    'nom': 'nom', 'name': 'nom',
+    'quantité': 'quantité', 'quantite': 'quantité', 'quantity': 'quantité',
+    'prix': 'prix', 'price': 'prix',
+    'catégorie': 'catégorie', 'categorie': 'catégorie',
+    'category': 'catégorie',
+}
+
+
+def column_name(text: str) -> str:
+    """Convert a command line column name to a CSVMerger column name."""
+    try:
+        return COLUMN_ALIASES[text.lower()]
+    except KeyError:
+        raise argparse.ArgumentTypeError(
+            f"unknown column '{text}' (choose from nom, quantité, prix,"
+            " catégorie)")
+
+
+def value_range(text: str) -> Tuple[float, float]:
+    """Parse a 'MIN:MAX' range, either bound may be left empty."""
+    try:
+        low, high = text.split(':')
+        return (float(low) if low else float('-inf'),
+                float(high) if high else float('inf'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid range '{text}' (expected MIN:MAX, e.g. 0.2:1)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the command line parser (interactive mode without command)."""
+    parser = argparse.ArgumentParser(
+        description='CSV Merger with language support')
+    parser.add_argument(
+        '--lang',
+        type=str,
+        choices=['fr', 'en'],
         default='fr',
         help='Choose language (fr: French, en: English)'
     )
-    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of CSV files read in parallel (default: 1)'
+    )
+    parser.add_argument(
+        '--processes',
+        action='store_true',
+        help='Use a process pool instead of threads for parallel reading'
+    )
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='Only re-read new or modified input files (cache in CSV-cache)'
+    )
+    parser.add_argument(
+        '--mmap',
+        action='store_true',
+        help='Read input files through mmap without decoding every field'
+    )
+    parser.add_argument(
+        '--pipeline',
+        action='store_true',
+        help='Overlap reading, merged output writing and sorted outputs'
+             ' (asyncio pipeline)'
+    )
+    parser.add_argument(
+        '--binary',
+        action='store_true',
+        help='Also write the merged data as a binary columnar file and'
+             ' reload it with mmap while the inputs are unchanged'
+    )
+    parser.add_argument(
+        '--compress',
+        choices=['gz', 'bz2', 'xz'],
+        help='Compress the files written to the output and sort folders'
+             ' (compressed inputs are always read)'
+    )
+
+    commands = parser.add_subparsers(
+        dest='command',
+        title='batch commands',
+        description='Run one operation without the interactive menus')
+
+    merge = commands.add_parser(
+        'merge', help='Merge the input CSV files into the output folder')
+    merge.add_argument(
+        '--stream',
+        action='store_true',
+        help='Stream rows to the output file without loading them all')
+    merge.add_argument(
+        '--report',
+        action='store_true',
+        help='Also generate the summary report')
+    merge.add_argument(
+        '--sort-by',
+        type=column_name,
+        action='append',
+        default=[],
+        metavar='COLUMN',
+        help='Also write the data sorted on this column to the sort folder'
+             ' (repeatable)')
+
+    sort = commands.add_parser('sort', help='Sort the merged data')
+    sort.add_argument('--by', type=column_name, required=True,
+                      help='Column to sort on')
+    sort.add_argument('--desc', action='store_true',
+                      help='Sort in descending order')
+
+    filter_ = commands.add_parser('filter', help='Filter the merged data')
+    filter_.add_argument('--name', help='Exact name (case insensitive)')
+    filter_.add_argument('--name-contains',
+                         help='Text contained in the name')
+    filter_.add_argument('--category',
+                         help='Exact category (case insensitive)')
+    filter_.add_argument('--quantity', help='Exact quantity')
+    filter_.add_argument('--price', help='Exact price')
+    filter_.add_argument('--quantity-range', type=value_range,
+                         metavar='MIN:MAX', help='Quantity range')
+    filter_.add_argument('--price-range', type=value_range,
+                         metavar='MIN:MAX', help='Price range')
+    filter_.add_argument('--by', type=column_name,
+                         help='Sort the filtered rows on this column')
+    filter_.add_argument('--desc', action='store_true',
+                         help='Sort in descending order')
+
+    for command in (sort, filter_):
+        command.add_argument(
+            '--output',
+            help='Name of the CSV file written to the sort folder'
+                 ' (without extension); rows go to stdout otherwise')
+        command.add_argument('--limit', type=int,
+                             help='Keep at most this many rows')
+        command.add_argument('--offset', type=int, default=0,
+                             help='Skip this many rows first (paging)')
+        command.add_argument(
+            '--memory-budget', type=int, metavar='MB',
+            help='Sort on disk with runs of about MB megabytes instead'
+                 ' of loading every row')
+
+    commands.add_parser('report', help='Generate the summary report')
+    return parser
+
+
+def run_batch(merger: CSVMerger, args: argparse.Namespace) -> int:
+    """Execute one batch command headlessly and return the exit code."""
+    for folder in (merger.input_folder, merger.output_folder,
+                   merger.sort_folder):
+        os.makedirs(folder, exist_ok=True)
+
+    if args.command in ('merge', 'report'):
+        if args.command == 'merge' and args.stream:
+            stats = merger.merge_csv_stream(language=args.lang,
+                                            report=args.report)
+            return 0 if stats is not None else 1
+
+        sorted_outputs = {}
+        if args.command == 'merge':
+            prefix = 'tri' if args.lang == 'fr' else 'sorted'
+            sorted_outputs = {
+                merger.output_file(merger.sort_folder,
+                                   f"{prefix}_{column}.csv"):
+                    ProductQuery().order_by(merger.columns[column])
+                for column in args.sort_by}
+
+        if args.pipeline and args.command == 'merge':
+            table = merger.merge_pipeline(args.lang, sorted_outputs)
+            if table is None:
+                return 1
+        else:
+            table = merger.merge_csv_table()
+            if table is None:
+                return 1
+
+            if args.command == 'merge':
+                merger.write_merged(table, args.lang)
+                for path, query in sorted_outputs.items():
+                    if args.lang == 'fr':
+                        merger.write_csv(query.execute(table), path)
+                    else:
+                        merger.write_csv_en(query.execute(table), path)
+
+        if args.command == 'report' or args.report:
+            if args.lang == 'fr':
+                merger.generate_csv_report(table)
+            else:
+                merger.generate_csv_report_en(table)
+        return 0
+
+    # Sort and filter build one query, its filters run while reading
+    columns = merger.columns
+    query = ProductQuery()
+    if args.command == 'filter':
+        try:
+            for column, value in ((columns['nom'], args.name),
+                                  (columns['catégorie'], args.category),
+                                  (columns['quantité'], args.quantity),
+                                  (columns['prix'], args.price)):
+                if value is not None:
+                    query.where_equal(column, value)
+        except ValueError as e:
+            print(f"Invalid numeric value: {e}", file=sys.stderr)
+            return 2
+        if args.name_contains is not None:
+            query.where_contains(columns['nom'], args.name_contains)
+        for column, bounds in ((columns['quantité'], args.quantity_range),
+                               (columns['prix'], args.price_range)):
+            if bounds is not None:
+                query.where_range(column, *bounds)
+
+    if args.by is not None:
+        query.order_by(columns[args.by], args.desc)
+    try:
+        query.limit(args.limit).offset(args.offset)
+    except ValueError as e:
+        print(f"Invalid value: {e}", file=sys.stderr)
+        return 2
+
+    if args.memory_budget is not None:
+        rows = merger.iter_sorted_external(
+            query, max(1, args.memory_budget) * 1024 * 1024)
+    else:
+        rows = merger.select(query)
+        if rows is None:
+            return 1
+
+    if args.output:
+        output_path = merger.output_file(merger.sort_folder,
+                                         f"{args.output}.csv")
+        if args.lang == 'fr':
+            merger.write_csv(rows, output_path)
+        else:
+            merger.write_csv_en(rows, output_path)
+    else:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(['Nom', 'Quantité', 'Prix', 'Catégorie']
+                        if args.lang == 'fr'
+                        else ['Name', 'Quantity', 'Price', 'Category'])
+        writer.writerows(rows)
+    return 0
+
+
+if __name__ == "__main__":
     # Parse arguments
-    args = parser.parse_args()
-    
-    # Create CSVMerger instance and run with selected language
-    merger = CSVMerger()
-    merger.run(args.lang)
\ No newline at end of file
+    args = build_parser().parse_args()
+
+    # Create CSVMerger instance
+    merger = CSVMerger(workers=args.workers, use_processes=args.processes,
+                       use_cache=args.cache, use_mmap=args.mmap,
+                       use_pipeline=args.pipeline,
+                       binary_output=args.binary,
+                       compression=args.compress)
+
+    # Without a command, run the interactive menus with selected language
+    if args.command is None:
+        merger.run(args.lang)
+    else:
+        try:
+            exit_code = run_batch(merger, args)
+        finally:
+            merger.close_binary()
+        sys.exit(exit_code)
@@ -1,3 +1,12 @@
+import operator
+from math import gcd, lcm
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel : repli en Python pur
+    np = None
+
+
 class Fraction:
     """Class representing a fraction and operations on it
 
@@ -6,6 +15,9 @@ class Fraction:
     This class allows fraction manipulations through several operations.
     """
 
+    # Deux entiers par instance, sans __dict__
+    __slots__ = ('_num', '_den')
+
     def __init__(self, num: int=0, den: int=1):
         """This builds a fraction based on some numerator and denominator.
 
@@ -20,18 +32,55 @@ class Fraction:
             den = -den
             num = -num
 
+        # Réduction par le pgcd (math.gcd, en C)
+        diviseur = gcd(num, den)
+        self._num = num // diviseur
+        self._den = den // diviseur
 
-        num_reduit = num
-        den_reduit = den
-        while den_reduit != 0:
-            temp = num_reduit % den_reduit
-            num_reduit = den_reduit
-            den_reduit = temp
+    @classmethod
+    def _reduced(cls, num: int, den: int):
+        """Build a fraction already in reduced form, without gcd
 
+        PRE : den > 0 et pgcd(num, den) == 1
+        POST : Retourne la fraction num/den sans repasser par la réduction du constructeur
+        """
+        fraction = cls.__new__(cls)
+        fraction._num = num
+        fraction._den = den
+        return fraction
 
-        self._num = num // num_reduit
-        self._den = den // num_reduit
-                
+    @classmethod
+    def sum(cls, fractions):
+        """Exact sum of an iterable of fractions, reduced only once
+
+        Les numérateurs sont d'abord additionnés par dénominateur, puis les groupes sont combinés
+        deux à deux sur le ppcm de leurs dénominateurs : pas de pgcd sur les numérateurs avant la
+        fin et des entiers de tailles équilibrées.
+
+        PRE : -
+        POST : Retourne la somme sous forme réduite (0 pour un itérable vide)
+        Raises : TypeError si un élément n'est pas un object de classe Fraction
+        """
+        groups = {}
+        for fraction in fractions:
+            if not isinstance(fraction, Fraction):
+                raise TypeError("Les éléments doivent être des objects de classe Fraction.")
+            groups[fraction._den] = groups.get(fraction._den, 0) + fraction._num
+
+        terms = [(num, den) for den, num in groups.items()]
+        if not terms:
+            return cls()
+        while len(terms) > 1:
+            combined = []
+            for i in range(0, len(terms) - 1, 2):
+                (num1, den1), (num2, den2) = terms[i], terms[i + 1]
+                common = lcm(den1, den2)
+                combined.append((num1 * (common // den1) + num2 * (common // den2), common))
+            if len(terms) % 2:
+                combined.append(terms[-1])
+            terms = combined
+        num, den = terms[0]
+        return cls(num, den)
 
     @property
     def numerator(self):
@@ -83,13 +132,26 @@ class Fraction:
 
         if other.numerator == 0:
             return self
-        if self.denominator == other.denominator:
-            new_num = self.numerator + other.numerator
-            new_den = self.denominator
-        else:
-            new_num = (self.numerator * other.denominator) + (other.numerator * self.denominator)
-            new_den = self.denominator * other.denominator
-        return Fraction(new_num,new_den)
+        return self._add(other.numerator, other.denominator)
+
+    def _add(self, num: int, den: int):
+        """Add the reduced fraction num/den to this fraction
+
+        Les dénominateurs ne sont multipliés qu'après division par leur pgcd : les entiers
+        intermédiaires restent petits et le résultat n'a besoin que d'un petit pgcd.
+
+        PRE : den > 0 et pgcd(num, den) == 1
+        POST : Retourne la somme sous forme réduite
+        """
+        g = gcd(self._den, den)
+        if g == 1:
+            return Fraction._reduced(self._num * den + num * self._den, self._den * den)
+        s = self._den // g
+        t = self._num * (den // g) + num * s
+        g2 = gcd(t, g)
+        if g2 == 1:
+            return Fraction._reduced(t, s * den)
+        return Fraction._reduced(t // g2, s * (den // g2))
 
     def __sub__(self, other: object):
         """Overloading of the - operator for fractions
@@ -100,14 +162,8 @@ class Fraction:
         """
         if not isinstance(other, Fraction):
             raise TypeError("other doit être un object de classe Fraction.")
-        
-        if self.denominator == other.denominator:
-            new_num = self.numerator - other.numerator
-            new_den = self.denominator
-        else:
-            new_num = (self.numerator * other.denominator) - (other.numerator * self.denominator)
-            new_den = self.denominator * other.denominator
-        return Fraction(new_num,new_den)
+
+        return self._add(-other.numerator, other.denominator)
 
 
     def __mul__(self, other: object):
@@ -119,9 +175,21 @@ class Fraction:
         """
         if not isinstance(other, Fraction):
             raise TypeError("other doit être un object de classe Fraction.")
-        new_num = self.numerator * other.numerator
-        new_den = self.denominator * self.denominator
-        return Fraction(new_num,new_den)
+        return self._mul(other.numerator, other.denominator)
+
+    def _mul(self, num: int, den: int):
+        """Multiply this fraction by the reduced fraction num/den
+
+        Simplification croisée : chaque numérateur est divisé par son pgcd avec l'autre
+        dénominateur avant de multiplier, le produit est alors déjà réduit.
+
+        PRE : den > 0 et pgcd(num, den) == 1
+        POST : Retourne le produit sous forme réduite
+        """
+        g1 = gcd(self._num, den)
+        g2 = gcd(num, self._den)
+        return Fraction._reduced((self._num // g1) * (num // g2),
+                                 (self._den // g2) * (den // g1))
 
 
     def __truediv__(self, other: object):
@@ -136,23 +204,45 @@ class Fraction:
         
         if other.numerator == 0:
             raise ValueError("Pas de division par 0")
-        
-        new_num = self.numerator * other.denominator
-        new_den = self.denominator * other.numerator
-        return Fraction(new_num,new_den)
 
+        # Diviser revient à multiplier par l'inverse (signe porté par le numérateur)
+        if other.numerator < 0:
+            return self._mul(-other.denominator, -other.numerator)
+        return self._mul(other.denominator, other.numerator)
 
-    def __pow__(self, other: int):
-        """Overloading of the ** operator for fractions
+
+    def __pow__(self, other: int, modulo: int=None):
+        """Overloading of the ** operator and of pow() for fractions
+
+        Les puissances de deux entiers premiers entre eux le restent : le résultat est déjà réduit
+        et aucun pgcd n'est calculé. int ** est une exponentiation rapide (carrés successifs), en C.
+        Avec pow(f, n, m), la fraction num/den est vue comme num * den^-1 modulo m.
 
         PRE : -
-        POST : Renvoie un objet qui est la puissance other de notre object
-        """  
-        new_num = self.numerator ** other
-        new_den = self.denominator ** other
-        return Fraction(new_num,new_den)
-    
-    
+        POST : Renvoie un objet qui est la puissance other de notre object ; un exposant négatif élève
+               l'inverse à la puissance -other. Avec modulo, renvoie l'entier num**other * den**-other mod m
+        Raises : TypeError si other n'est pas un entier, ValueError si other < 0 et que la fraction est nulle,
+                 ou si avec modulo le dénominateur (le numérateur pour other < 0) n'est pas inversible modulo m
+        """
+        if not isinstance(other, int):
+            raise TypeError("other doit être un entier.")
+
+        if modulo is not None:
+            try:
+                return pow(self._num, other, modulo) * pow(self._den, -other, modulo) % modulo
+            except ValueError:
+                raise ValueError(f"{self} n'a pas de puissance {other} modulo {modulo}") from None
+
+        if other >= 0:
+            return Fraction._reduced(self._num ** other, self._den ** other)
+        if self._num == 0:
+            raise ValueError("Impossible de diviser par zéro")
+        # Exposant négatif : puissance de l'inverse, le signe reste au numérateur
+        if self._num < 0:
+            return Fraction._reduced((-self._den) ** -other, (-self._num) ** -other)
+        return Fraction._reduced(self._den ** -other, self._num ** -other)
+
+
     def __eq__(self, other: object) : 
         """Overloading of the == operator for fractions
         
@@ -165,6 +255,14 @@ class Fraction:
         output = (self.numerator == other.numerator and self.denominator == other.denominator)
         return output
 
+    def __hash__(self):
+        """Hash of the fraction, usable as a dict key or in a set
+
+        PRE : -
+        POST : Retourne le même hash pour deux fractions égales (forme réduite identique)
+        """
+        return hash((self._num, self._den))
+
         
     def __float__(self) :
         """Returns the decimal value of the fraction
@@ -235,7 +333,402 @@ class Fraction:
         new_den = self.denominator * other.denominator
         difference = Fraction(abs(new_num), new_den)
         return difference.numerator == 1 and difference.denominator != 0
-    
+
+
+# Plus grand entier stocké en int64 ; au-delà, les tableaux passent en entiers Python (dtype object)
+INT64_MAX = 2 ** 63 - 1
+
+
+def _fit(column):
+    """Store a column in int64 when every value fits
+
+    PRE : column est un tableau NumPy d'entiers
+    POST : Retourne column en int64 si possible, sinon en dtype object
+    """
+    if column.dtype != object:
+        return column
+    if len(column) and (column.max() > INT64_MAX or column.min() < -INT64_MAX):
+        return column
+    return column.astype(np.int64)
+
+
+def _as_column(values):
+    """Convert a sequence of integers to a column of a FractionArray
+
+    PRE : -
+    POST : Retourne un tableau int64 (ou object si une valeur dépasse int64), une liste sans NumPy
+    Raises : TypeError si une valeur n'est pas un entier
+    """
+    if np is None:
+        return [operator.index(value) for value in values]
+    column = np.asarray(values)
+    if column.ndim != 1:
+        column = column.reshape(-1)
+    if column.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    if column.dtype == object:
+        return _fit(np.array([operator.index(value) for value in column.tolist()], dtype=object))
+    if column.dtype.kind not in 'iu':
+        raise TypeError("Les numérateurs et dénominateurs doivent être des entiers.")
+    # -2**63 est exclu : sa négation ne tient pas en int64
+    if int(column.max()) > INT64_MAX or int(column.min()) < -INT64_MAX:
+        return column.astype(object)
+    return column.astype(np.int64, copy=False)
+
+
+def _bound(column):
+    """Largest absolute value of a column, as a Python integer
+
+    PRE : -
+    POST : Retourne max(|x|) pour x dans column, 0 si column est vide
+    """
+    if not len(column):
+        return 0
+    return max(int(column.max()), -int(column.min()))
+
+
+def _promote(overflow, *columns):
+    """Switch columns to Python integers before an operation that would overflow int64
+
+    PRE : overflow est True si un résultat peut dépasser int64
+    POST : Retourne les colonnes, en dtype object si overflow
+    """
+    if not overflow:
+        return columns
+    return tuple(column.astype(object) for column in columns)
+
+
+class FractionArray:
+    """Array of fractions stored as two parallel integer arrays
+
+    Les numérateurs et dénominateurs sont rangés dans deux tableaux NumPy int64 : les
+    opérations se font élément par élément en une seule passe vectorisée. Si un résultat
+    peut dépasser int64, les tableaux passent en entiers Python (dtype object) puis
+    reviennent en int64 dès que les valeurs réduites y tiennent à nouveau.
+    Sans NumPy, deux listes d'entiers et les opérations de Fraction sont utilisées.
+    """
+
+    __slots__ = ('_num', '_den')
+
+    def __init__(self, fractions=()):
+        """Build an array from an iterable of fractions
+
+        PRE : -
+        POST : initialise les tableaux de numérateurs et de dénominateurs, déjà réduits
+        Raises : TypeError si un élément n'est pas un object de classe Fraction
+        """
+        nums = []
+        dens = []
+        for fraction in fractions:
+            if not isinstance(fraction, Fraction):
+                raise TypeError("Les éléments doivent être des objects de classe Fraction.")
+            nums.append(fraction.numerator)
+            dens.append(fraction.denominator)
+        self._num = _as_column(nums)
+        self._den = _as_column(dens)
+
+    @classmethod
+    def from_arrays(cls, numerators, denominators):
+        """Build an array from parallel sequences of numerators and denominators
+
+        PRE : -
+        POST : Retourne les fractions réduites, avec le signe porté par le numérateur
+        Raises : TypeError si une valeur n'est pas un entier, ValueError si un dénominateur est égal à 0
+                 ou si les deux séquences n'ont pas la même longueur
+        """
+        num = _as_column(numerators)
+        den = _as_column(denominators)
+        if len(num) != len(den):
+            raise ValueError("Les deux tableaux doivent avoir la même longueur.")
+
+        if np is None:
+            fractions = [Fraction(a, b) for a, b in zip(num, den)]
+            return cls._reduced([f.numerator for f in fractions],
+                                [f.denominator for f in fractions])
+
+        if (den == 0).any():
+            raise ValueError("Impossible de diviser par zéro")
+        negative = den < 0
+        if negative.any():
+            num = np.where(negative, -num, num)
+            den = np.where(negative, -den, den)
+        divisor = np.gcd(num, den)
+        return cls._reduced(_fit(num // divisor), _fit(den // divisor))
+
+    @classmethod
+    def _reduced(cls, num, den):
+        """Build an array from columns already in reduced form, without gcd
+
+        PRE : den > 0 et pgcd(num, den) == 1 pour chaque élément
+        POST : Retourne le tableau sans repasser par la réduction
+        """
+        array = cls.__new__(cls)
+        array._num = num
+        array._den = den
+        return array
+
+    @property
+    def numerators(self):
+        return self._num
+    @property
+    def denominators(self):
+        return self._den
+
+# ------------------ Container ------------------
+
+    def __len__(self):
+        return len(self._num)
+
+    def __getitem__(self, index):
+        """Access one fraction or a sub-array
+
+        PRE : -
+        POST : Retourne une Fraction pour un indice entier, un FractionArray pour une tranche
+               (ou un masque booléen avec NumPy)
+        """
+        if isinstance(index, slice) or (np is not None and isinstance(index, np.ndarray)):
+            return FractionArray._reduced(self._num[index], self._den[index])
+        return Fraction._reduced(int(self._num[index]), int(self._den[index]))
+
+    def __iter__(self):
+        if np is None:
+            return map(Fraction._reduced, self._num, self._den)
+        return map(Fraction._reduced, self._num.tolist(), self._den.tolist())
+
+    def __repr__(self):
+        return f"FractionArray([{', '.join(str(fraction) for fraction in self)}])"
+
+# ------------------ Operators overloading ------------------
+
+    def _operand(self, other):
+        """Columns of the right operand, aligned on this array
+
+        PRE : -
+        POST : Retourne (numérateurs, dénominateurs) de other ; une Fraction est répétée sur tout le tableau
+        Raises : TypeError si other n'est ni une Fraction ni un FractionArray,
+                 ValueError si les deux tableaux n'ont pas la même longueur
+        """
+        if isinstance(other, Fraction):
+            if np is None:
+                return [other.numerator] * len(self), [other.denominator] * len(self)
+            # Colonnes de longueur 1, étendues par le broadcasting de NumPy
+            return _as_column([other.numerator]), _as_column([other.denominator])
+        if not isinstance(other, FractionArray):
+            raise TypeError("other doit être un object de classe Fraction ou FractionArray.")
+        if len(other) != len(self):
+            raise ValueError("Les deux tableaux doivent avoir la même longueur.")
+        return other._num, other._den
+
+    def _map(self, operation, num, den):
+        """Apply a Fraction operation element by element (without NumPy)
+
+        PRE : operation est Fraction._add ou Fraction._mul, den > 0
+        POST : Retourne le tableau des résultats
+        """
+        results = [operation(Fraction._reduced(a, b), c, d)
+                   for a, b, c, d in zip(self._num, self._den, num, den)]
+        return FractionArray._reduced([f.numerator for f in results],
+                                      [f.denominator for f in results])
+
+    def _add(self, num, den):
+        """Add the reduced fractions num/den element by element
+
+        Même méthode que Fraction._add : les dénominateurs sont divisés par leur pgcd avant
+        d'être multipliés.
+
+        PRE : den > 0 et pgcd(num, den) == 1
+        POST : Retourne les sommes sous forme réduite
+        """
+        if np is None:
+            return self._map(Fraction._add, num, den)
+        a, b = self._num, self._den
+        g = np.gcd(b, den)
+        s = b // g
+        e = den // g
+        overflow = max(_bound(a) * _bound(e) + _bound(num) * _bound(s),
+                       _bound(s) * _bound(den)) > INT64_MAX
+        a, num, den, g, s, e = _promote(overflow, a, num, den, g, s, e)
+        t = a * e + num * s
+        g2 = np.gcd(t, g)
+        return FractionArray._reduced(_fit(t // g2), _fit(s * (den // g2)))
+
+    def _mul(self, num, den):
+        """Multiply by the reduced fractions num/den element by element, with cross-cancellation
+
+        PRE : den > 0 et pgcd(num, den) == 1
+        POST : Retourne les produits sous forme réduite
+        """
+        if np is None:
+            return self._map(Fraction._mul, num, den)
+        g1 = np.gcd(self._num, den)
+        g2 = np.gcd(num, self._den)
+        a, den = self._num // g1, den // g1
+        num, b = num // g2, self._den // g2
+        overflow = max(_bound(a) * _bound(num), _bound(b) * _bound(den)) > INT64_MAX
+        a, b, num, den = _promote(overflow, a, b, num, den)
+        return FractionArray._reduced(_fit(a * num), _fit(b * den))
+
+    @staticmethod
+    def _inverse(num, den):
+        """Columns of the inverses, with the sign on the numerator
+
+        PRE : aucun numérateur n'est égal à 0
+        POST : Retourne (numérateurs, dénominateurs) des fractions inverses
+        """
+        if np is None:
+            return ([-b if a < 0 else b for a, b in zip(num, den)],
+                    [abs(a) for a in num])
+        return np.where(num < 0, -den, den), np.abs(num)
+
+    def __add__(self, other: object):
+        """Overloading of the + operator, element by element
+
+        PRE : -
+        POST : Renvoie un nouveau FractionArray ; une Fraction est ajoutée à chaque élément
+        Raises : TypeError si other n'est ni une Fraction ni un FractionArray,
+                 ValueError si les longueurs diffèrent
+        """
+        return self._add(*self._operand(other))
+
+    def __sub__(self, other: object):
+        """Overloading of the - operator, element by element
+
+        PRE : -
+        POST : Renvoie un nouveau FractionArray issu de la soustraction élément par élément
+        Raises : TypeError si other n'est ni une Fraction ni un FractionArray,
+                 ValueError si les longueurs diffèrent
+        """
+        num, den = self._operand(other)
+        if np is None:
+            num = [-a for a in num]
+        else:
+            num = -num
+        return self._add(num, den)
+
+    def __mul__(self, other: object):
+        """Overloading of the * operator, element by element
+
+        PRE : -
+        POST : Renvoie un nouveau FractionArray issu de la multiplication élément par élément
+        Raises : TypeError si other n'est ni une Fraction ni un FractionArray,
+                 ValueError si les longueurs diffèrent
+        """
+        return self._mul(*self._operand(other))
+
+    def __truediv__(self, other: object):
+        """Overloading of the / operator, element by element
+
+        PRE : -
+        POST : Renvoie un nouveau FractionArray issu de la division élément par élément
+        Raises : TypeError si other n'est ni une Fraction ni un FractionArray,
+                 ValueError si un numérateur de other est égal à 0 ou si les longueurs diffèrent
+        """
+        num, den = self._operand(other)
+        if 0 in num:
+            raise ValueError("Pas de division par 0")
+        return self._mul(*self._inverse(num, den))
+
+    def __pow__(self, other: int):
+        """Overloading of the ** operator, every element raised to the same integer power
+
+        PRE : -
+        POST : Renvoie un nouveau FractionArray ; les puissances de num et den restent premières entre elles
+        Raises : TypeError si other n'est pas un entier, ValueError si other < 0 et qu'un élément est égal à 0
+        """
+        if not isinstance(other, int):
+            raise TypeError("other doit être un entier.")
+        num, den = self._num, self._den
+        if other < 0:
+            if 0 in num:
+                raise ValueError("Impossible de diviser par zéro")
+            num, den = self._inverse(num, den)
+            other = -other
+        if np is None:
+            return FractionArray._reduced([a ** other for a in num], [b ** other for b in den])
+        # Estimation par le nombre de bits, sans calculer la puissance de la borne
+        overflow = max(_bound(num), _bound(den)).bit_length() * other > 63
+        num, den = _promote(overflow, num, den)
+        return FractionArray._reduced(_fit(num ** other), _fit(den ** other))
+
+    def __neg__(self):
+        if np is None:
+            return FractionArray._reduced([-a for a in self._num], self._den)
+        return FractionArray._reduced(-self._num, self._den)
+
+    def _compare(self, other, compare):
+        """Compare element by element through a*d and c*b (dénominateurs positifs)
+
+        PRE : compare est une fonction du module operator (lt, le, gt, ge)
+        POST : Retourne un tableau de booléens (une liste sans NumPy)
+        """
+        num, den = self._operand(other)
+        if np is None:
+            return [compare(a * d, c * b) for a, b, c, d in zip(self._num, self._den, num, den)]
+        a, b = self._num, self._den
+        overflow = max(_bound(a) * _bound(den), _bound(num) * _bound(b)) > INT64_MAX
+        a, b, num, den = _promote(overflow, a, b, num, den)
+        return compare(a * den, num * b)
+
+    def __eq__(self, other: object):
+        """Overloading of the == operator, element by element
+
+        Les fractions étant réduites, il suffit de comparer numérateurs et dénominateurs.
+
+        PRE : -
+        POST : Retourne un tableau de booléens (une liste sans NumPy)
+        Raises : TypeError si other n'est ni une Fraction ni un FractionArray,
+                 ValueError si les longueurs diffèrent
+        """
+        num, den = self._operand(other)
+        if np is None:
+            return [a == c and b == d for a, b, c, d in zip(self._num, self._den, num, den)]
+        return (self._num == num) & (self._den == den)
+
+    def __ne__(self, other: object):
+        if np is None:
+            return [not equal for equal in self == other]
+        return ~(self == other)
+
+    def __lt__(self, other: object):
+        return self._compare(other, operator.lt)
+
+    def __le__(self, other: object):
+        return self._compare(other, operator.le)
+
+    def __gt__(self, other: object):
+        return self._compare(other, operator.gt)
+
+    def __ge__(self, other: object):
+        return self._compare(other, operator.ge)
+
+    # Les comparaisons renvoient des tableaux : un FractionArray n'est pas hashable
+    __hash__ = None
+
+# ------------------ Reductions ------------------
+
+    def sum(self):
+        """Exact sum of every element
+
+        Les éléments sont additionnés moitié contre moitié : log2(n) additions vectorisées dont
+        les dénominateurs grandissent de façon équilibrée.
+
+        PRE : -
+        POST : Retourne la somme sous forme de Fraction (0 pour un tableau vide)
+        """
+        array = self
+        leftovers = []
+        while len(array) > 1:
+            if len(array) % 2:
+                leftovers.append(array[len(array) - 1])
+                array = array[:len(array) - 1]
+            half = len(array) // 2
+            array = array[:half] + array[half:]
+        total = array[0] if len(array) else Fraction()
+        for fraction in leftovers:
+            total = total + fraction
+        return total
+
+
 f1 = Fraction(1,2)
 f2 = Fraction(7,9)
 f3 = Fraction(1,2)
@@ -116,6 +116,110 @@ class TestMethods(unittest.TestCase):
         self.assertEqual(result3.numerator, -15)
         self.assertEqual(result3.denominator, 8)
 
+    def test_product(self):
+        frac1 = Fraction(1, 2)
+        frac2 = Fraction(7, 9)
+        result1 = frac1 * frac2
+        self.assertEqual(result1.numerator, 7)
+        self.assertEqual(result1.denominator, 18)
+
+        # Simplification croisée : 4/9 * 3/8 = 1/6
+        result2 = Fraction(4, 9) * Fraction(3, 8)
+        self.assertEqual(result2.numerator, 1)
+        self.assertEqual(result2.denominator, 6)
+
+        result3 = Fraction(-3, 4) * Fraction(0, 7)
+        self.assertEqual(result3.numerator, 0)
+        self.assertEqual(result3.denominator, 1)
+
+        with self.assertRaises(TypeError):
+            frac1 * 2
+
+    def test_sub(self):
+        result1 = Fraction(1, 2) - Fraction(7, 9)
+        self.assertEqual(result1.numerator, -5)
+        self.assertEqual(result1.denominator, 18)
+
+        # Dénominateurs non premiers entre eux : 5/6 - 1/3 = 1/2
+        result2 = Fraction(5, 6) - Fraction(1, 3)
+        self.assertEqual(result2.numerator, 1)
+        self.assertEqual(result2.denominator, 2)
+
+        result3 = Fraction(3, 4) - Fraction(3, 4)
+        self.assertEqual(result3.numerator, 0)
+        self.assertEqual(result3.denominator, 1)
+
+    def test_reduced_results(self):
+        # Les résultats restent sous forme réduite sur une longue accumulation
+        total = Fraction()
+        for i in range(1, 30):
+            total = total + Fraction(1, i * (i + 1))
+        self.assertEqual(total.numerator, 29)
+        self.assertEqual(total.denominator, 30)
+
+        product = Fraction(1)
+        for i in range(1, 30):
+            product = product * Fraction(i, i + 1)
+        self.assertEqual(product.numerator, 1)
+        self.assertEqual(product.denominator, 30)
+
+        result = Fraction(6, 35) / Fraction(-9, 14)
+        self.assertEqual(result.numerator, -4)
+        self.assertEqual(result.denominator, 15)
+
+    def test_sum(self):
+        fractions = [Fraction(1, i * (i + 1)) for i in range(1, 30)]
+        result1 = Fraction.sum(fractions)
+        self.assertEqual(result1.numerator, 29)
+        self.assertEqual(result1.denominator, 30)
+
+        # Dénominateurs répétés et somme nulle
+        result2 = Fraction.sum([Fraction(1, 6), Fraction(1, 3), Fraction(-1, 6), Fraction(-1, 3)])
+        self.assertEqual(result2.numerator, 0)
+        self.assertEqual(result2.denominator, 1)
+
+        result3 = Fraction.sum(Fraction(1, 4) for _ in range(6))
+        self.assertEqual(result3, Fraction(3, 2))
+        self.assertEqual(Fraction.sum([]), Fraction(0))
+
+        with self.assertRaises(TypeError):
+            Fraction.sum([Fraction(1, 2), 3])
+
+    def test_pow(self):
+        result1 = Fraction(2, 3) ** 3
+        self.assertEqual(result1.numerator, 8)
+        self.assertEqual(result1.denominator, 27)
+
+        self.assertEqual(Fraction(-2, 3) ** 0, Fraction(1))
+
+        # Exposant négatif : puissance de l'inverse, signe au numérateur
+        result2 = Fraction(-2, 3) ** -3
+        self.assertEqual(result2.numerator, -27)
+        self.assertEqual(result2.denominator, 8)
+
+        result3 = Fraction(-2, 3) ** -2
+        self.assertEqual(result3.numerator, 9)
+        self.assertEqual(result3.denominator, 4)
+
+        result4 = Fraction(3, 2) ** 200
+        self.assertEqual(result4.numerator, 3 ** 200)
+        self.assertEqual(result4.denominator, 2 ** 200)
+
+        with self.assertRaises(ValueError):
+            Fraction(0, 5) ** -1
+        with self.assertRaises(TypeError):
+            Fraction(1, 2) ** Fraction(1, 2)
+
+    def test_pow_modulo(self):
+        # 1/2 modulo 7 : 2 * 4 = 8 = 1 mod 7
+        self.assertEqual(pow(Fraction(1, 2), 1, 7), 4)
+        self.assertEqual(pow(Fraction(1, 2), 3, 7), 1)
+        self.assertEqual(pow(Fraction(3, 5), -1, 11), pow(Fraction(5, 3), 1, 11))
+        self.assertEqual(pow(Fraction(-3, 4), 5, 97), (-3) ** 5 * pow(4 ** 5, -1, 97) % 97)
+
+        with self.assertRaises(ValueError):
+            pow(Fraction(1, 7), 2, 7)
+
     def test_eq(self):
         frac1 = Fraction(2, 3)
         frac2 = Fraction(2, 3)
@@ -180,6 +284,84 @@ class TestMethods(unittest.TestCase):
         with self.assertRaises(TypeError):
             frac1.is_adjacent_to("Not a fraction")
 
+    def test_hash(self):
+        frac1 = Fraction(2, 4)
+        frac2 = Fraction(1, 2)
+        self.assertEqual(hash(frac1), hash(frac2))
+
+        prices = {frac1: "demi"}
+        self.assertEqual(prices[frac2], "demi")
+        self.assertEqual(len({Fraction(1, 3), Fraction(2, 6), Fraction(-1, -3)}), 1)
+
+    def test_slots(self):
+        frac1 = Fraction(1, 2)
+        self.assertFalse(hasattr(frac1, '__dict__'))
+        with self.assertRaises(AttributeError):
+            frac1.autre = 3
+
+
+class TestFractionArray(unittest.TestCase):
+
+    def test_init(self):
+        array1 = FractionArray([Fraction(2, 4), Fraction(-1, 3)])
+        self.assertEqual(len(array1), 2)
+        self.assertEqual(array1[0], Fraction(1, 2))
+        self.assertEqual(array1[1], Fraction(-1, 3))
+
+        # Réduction et signe porté par le numérateur
+        array2 = FractionArray.from_arrays([2, -3, 4, 0], [4, -9, -6, 7])
+        self.assertEqual(list(array2), [Fraction(1, 2), Fraction(1, 3), Fraction(-2, 3), Fraction(0)])
+
+        with self.assertRaises(ValueError):
+            FractionArray.from_arrays([1, 2], [3, 0])
+        with self.assertRaises(ValueError):
+            FractionArray.from_arrays([1, 2], [3])
+        with self.assertRaises(TypeError):
+            FractionArray([Fraction(1, 2), 3])
+
+    def test_operators(self):
+        array1 = FractionArray([Fraction(1, 2), Fraction(5, 6), Fraction(-3, 4)])
+        array2 = FractionArray([Fraction(7, 9), Fraction(1, 3), Fraction(2, 5)])
+        self.assertEqual(list(array1 + array2), [Fraction(23, 18), Fraction(7, 6), Fraction(-7, 20)])
+        self.assertEqual(list(array1 - array2), [Fraction(-5, 18), Fraction(1, 2), Fraction(-23, 20)])
+        self.assertEqual(list(array1 * array2), [Fraction(7, 18), Fraction(5, 18), Fraction(-3, 10)])
+        self.assertEqual(list(array1 / array2), [Fraction(9, 14), Fraction(5, 2), Fraction(-15, 8)])
+        self.assertEqual(list(array1 ** 2), [Fraction(1, 4), Fraction(25, 36), Fraction(9, 16)])
+        self.assertEqual(list(array1 ** -1), [Fraction(2), Fraction(6, 5), Fraction(-4, 3)])
+
+        # Une Fraction s'applique à chaque élément
+        self.assertEqual(list(array1 * Fraction(2)), [Fraction(1), Fraction(5, 3), Fraction(-3, 2)])
+
+        with self.assertRaises(ValueError):
+            array1 / FractionArray([Fraction(1), Fraction(0), Fraction(1)])
+        with self.assertRaises(ValueError):
+            array1 + FractionArray([Fraction(1)])
+        with self.assertRaises(TypeError):
+            array1 + 2
+
+    def test_overflow(self):
+        # Les produits dépassent int64 : le résultat reste exact
+        big = Fraction(2 ** 62 - 1, 3)
+        array = FractionArray([big, Fraction(1, 2)])
+        result = array * array
+        self.assertEqual(result[0], Fraction((2 ** 62 - 1) ** 2, 9))
+        self.assertEqual(result[1], Fraction(1, 4))
+        self.assertEqual(list(result / array), list(array))
+
+    def test_compare(self):
+        array1 = FractionArray([Fraction(1, 2), Fraction(2, 3), Fraction(-1, 4)])
+        array2 = FractionArray([Fraction(2, 4), Fraction(3, 5), Fraction(1, 4)])
+        self.assertEqual(list(array1 == array2), [True, False, False])
+        self.assertEqual(list(array1 != array2), [False, True, True])
+        self.assertEqual(list(array1 < array2), [False, False, True])
+        self.assertEqual(list(array1 >= array2), [True, True, False])
+        self.assertEqual(list(array1 > Fraction(0)), [True, True, False])
+
+    def test_sum(self):
+        array = FractionArray([Fraction(1, i * (i + 1)) for i in range(1, 30)])
+        self.assertEqual(array.sum(), Fraction(29, 30))
+        self.assertEqual(FractionArray().sum(), Fraction(0))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
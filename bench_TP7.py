@@ -0,0 +1,157 @@
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from math import gcd
+
+from TP7 import Fraction, FractionArray
+
+
+class DictFraction:
+    """Fraction stored in a per-instance __dict__ (representation before __slots__)
+
+    Classe indépendante de Fraction : hériter d'une classe à __slots__ ajouterait un __dict__
+    sans retirer les slots, ce qui ne mesure pas l'ancienne représentation.
+    """
+
+    def __init__(self, num=0, den=1):
+        """Build the reduced fraction num/den like Fraction.__init__
+
+        PRE : den != 0
+        POST : initialise _num et _den dans le __dict__ de l'instance, fraction réduite
+        """
+        if den < 0:
+            den = -den
+            num = -num
+        diviseur = gcd(num, den)
+        self._num = num // diviseur
+        self._den = den // diviseur
+
+
+def bytes_per_instance(cls, count):
+    """Measure the memory allocated per instance of cls, in bytes
+
+    PRE : count > 0
+    POST : Retourne le nombre moyen d'octets alloués par fraction créée
+    """
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        fractions = [cls(i, i + 1) for i in range(1, count + 1)]
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # La liste elle-même n'est pas comptée
+    return (after - before - sys.getsizeof(fractions)) / count
+
+
+def bench_memory(count):
+    """Compare bytes per instance with and without __slots__
+
+    PRE : count > 0
+    POST : Retourne un dictionnaire {représentation: octets par instance}
+    """
+    return {'__dict__': bytes_per_instance(DictFraction, count),
+            '__slots__': bytes_per_instance(Fraction, count)}
+
+
+def bench_operators(count, seed=0):
+    """Measure the throughput of + - * / on random fractions
+
+    PRE : count > 0
+    POST : Retourne un dictionnaire {opérateur: opérations par seconde}
+    """
+    rng = random.Random(seed)
+    pairs = [(Fraction(rng.randint(-1000, 1000), rng.randint(1, 1000)),
+              Fraction(rng.randint(1, 1000), rng.randint(1, 1000)))
+             for _ in range(count)]
+    results = {}
+    for name, operator in (('+', Fraction.__add__), ('-', Fraction.__sub__),
+                           ('*', Fraction.__mul__), ('/', Fraction.__truediv__)):
+        start = time.perf_counter()
+        for left, right in pairs:
+            operator(left, right)
+        results[name] = count / (time.perf_counter() - start)
+    return results
+
+
+def bench_accumulation(count):
+    """Sum the fractions 1/(i(i+1)) and time the whole accumulation
+
+    PRE : count > 0
+    POST : Retourne (secondes, nombre de bits du dénominateur final)
+    """
+    start = time.perf_counter()
+    total = Fraction()
+    for i in range(1, count + 1):
+        total = total + Fraction(1, i * (i + 1))
+    return time.perf_counter() - start, total.denominator.bit_length()
+
+
+def bench_array(count, seed=0):
+    """Compare element-wise operations on lists of Fraction and on FractionArray
+
+    PRE : count > 0
+    POST : Retourne un dictionnaire {opérateur: (fractions par seconde en liste, en FractionArray)}
+    """
+    rng = random.Random(seed)
+    left = [Fraction(rng.randint(-1000, 1000), rng.randint(1, 1000)) for _ in range(count)]
+    right = [Fraction(rng.randint(1, 1000), rng.randint(1, 1000)) for _ in range(count)]
+    left_array = FractionArray(left)
+    right_array = FractionArray(right)
+    results = {}
+    for name, operator in (('+', Fraction.__add__), ('*', Fraction.__mul__),
+                           ('/', Fraction.__truediv__)):
+        start = time.perf_counter()
+        [operator(a, b) for a, b in zip(left, right)]
+        middle = time.perf_counter()
+        getattr(FractionArray, operator.__name__)(left_array, right_array)
+        end = time.perf_counter()
+        results[name] = (count / (middle - start), count / (end - middle))
+    return results
+
+
+def bench_sum(count, seed=0):
+    """Compare repeated + with Fraction.sum on fractions with many distinct denominators
+
+    PRE : count > 0
+    POST : Retourne (secondes avec +, secondes avec Fraction.sum)
+    """
+    rng = random.Random(seed)
+    fractions = [Fraction(rng.randint(-1000, 1000), rng.randint(1, 10000)) for _ in range(count)]
+    start = time.perf_counter()
+    total = Fraction()
+    for fraction in fractions:
+        total = total + fraction
+    middle = time.perf_counter()
+    Fraction.sum(fractions)
+    return middle - start, time.perf_counter() - middle
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description='Benchmark the Fraction class of TP7')
+    parser.add_argument('--count', type=int, default=100000,
+                        help='Number of fractions created (default: 100000)')
+    args = parser.parse_args()
+
+    print(f"Memory ({args.count} fractions)")
+    for name, size in bench_memory(args.count).items():
+        print(f"  {name:<10} {size:8.1f} bytes per instance")
+
+    print(f"\nOperators ({args.count} operations each)")
+    for name, rate in bench_operators(args.count).items():
+        print(f"  {name:<10} {rate:12.0f} ops/s")
+
+    print(f"\nElement-wise on {args.count} fractions (list -> FractionArray)")
+    for name, (listed, vectorized) in bench_array(args.count).items():
+        print(f"  {name:<10} {listed:12.0f} -> {vectorized:12.0f} fractions/s")
+
+    repeated, grouped = bench_sum(args.count)
+    print(f"\nSum of {args.count} fractions: {repeated * 1000:.1f} ms with +,"
+          f" {grouped * 1000:.1f} ms with Fraction.sum")
+
+    seconds, bits = bench_accumulation(args.count)
+    print(f"\nAccumulation of {args.count} terms: {seconds * 1000:.1f} ms,"
+          f" final denominator on {bits} bits")